@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Offline setup for the benchmark suite.
+
+The benchmarks need pytest-benchmark (``pip install pytest-benchmark``) and
+are not collected by the normal test run. Run them explicitly, e.g.::
+
+    pytest benchmarks
+    pytest benchmarks --benchmark-autosave      # store a baseline
+    pytest benchmarks --benchmark-compare       # compare against it
+
+Everything runs without network access: passbands are synthetic boxcars, the
+filter system and spectral libraries are stand-ins, and all templates are
+analytic blackbodies built locally.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import spextra
+import scopesim_targets  # noqa: F401 (YAML registration, as in the tests)
+from scopesim_targets import target, extended_source
+from scopesim_targets.stellar import populations
+
+from .synthetic import (
+    SyntheticFilterSystem,
+    SyntheticLibrary,
+    SyntheticSpextrum,
+    synthetic_passband,
+    synthetic_vega,
+)
+
+
+def _clear_caches() -> None:
+    target.get_passband.cache_clear()
+    target.get_zero_point.cache_clear()
+    target.SpectrumTarget.clear_spectrum_cache()
+    extended_source.BrightnessProfile.clear_weightmap_cache()
+    populations._spec_library.cache_clear()
+    populations._library_parameters.cache_clear()
+    populations._library_template.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def offline_photometry(monkeypatch):
+    """Patch all network-backed spextra entry points with local stand-ins."""
+    monkeypatch.setattr(spextra, "Passband", synthetic_passband)
+    monkeypatch.setattr(spextra, "Spextrum", SyntheticSpextrum)
+    monkeypatch.setattr(spextra, "SpecLibrary", SyntheticLibrary)
+    monkeypatch.setattr(target, "_filter_system", SyntheticFilterSystem)
+    monkeypatch.setattr(target, "_vega_reference", synthetic_vega)
+    _clear_caches()
+    yield
+    _clear_caches()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Synthetic, offline stand-ins for the network-backed spextra objects."""
+
+import numpy as np
+from astropy import units as u
+from astropy.modeling.models import Box1D
+from synphot import SourceSpectrum, SpectralElement
+from synphot.models import BlackBodyNorm1D, Empirical1D
+
+
+BANDS = {
+    "U": 3650, "B": 4450, "V": 5510, "R": 6580, "I": 8060,
+    "J": 12200, "H": 16300, "K": 21900, "Ks": 21500,
+}
+
+
+class SyntheticFilterSystem:
+    """Stand-in for ``spextra.FilterSystem``: known band names only."""
+
+    name = "synthetic"
+
+    def __contains__(self, band) -> bool:
+        return band in BANDS
+
+
+class SyntheticLibrary:
+    """Stand-in for ``spextra.SpecLibrary``.
+
+    Lists the spectral types of the default lookup table, so every sampled
+    mass finds a template.
+    """
+
+    def __init__(self, name: str):
+        from scopesim_targets.spectral_classes import StellarParameters
+        self.name = name
+        self._templates = [
+            str(spectype)
+            for spectype in StellarParameters().table["spectral_type"]
+        ]
+
+    def __iter__(self):
+        return iter(self._templates)
+
+
+# Sampling of the tabulated templates, like a low-resolution library.
+WAVELENGTHS = np.geomspace(1000, 30000, 3000)
+
+
+class SyntheticSpextrum(SourceSpectrum):
+    """Tabulated blackbody stand-in for a library ``Spextrum`` template.
+
+    Called with a template name like ``Spextrum``; synphot's arithmetic calls
+    it with a model class like ``SourceSpectrum``.
+    """
+
+    basename = "G2V"
+
+    def __init__(self, modelclass="synthetic/G2V", temperature=5800, **kwargs):
+        if isinstance(modelclass, str):
+            self.basename = modelclass.rpartition("/")[-1]
+            blackbody = SourceSpectrum(BlackBodyNorm1D, temperature=temperature)
+            kwargs = {
+                "points": WAVELENGTHS,
+                "lookup_table": blackbody(WAVELENGTHS),
+            }
+            modelclass = Empirical1D
+        super().__init__(modelclass, **kwargs)
+
+    def scale_to_magnitude(self, amplitude, filter_curve=None):
+        return self
+
+    def redshift(self, z=0, vel=0):
+        return self
+
+    @classmethod
+    def black_body_spectrum(cls, temperature, amplitude=None, filter_curve=None):
+        return cls(temperature=u.Quantity(temperature, u.K).value)
+
+
+def synthetic_passband(name: str) -> SpectralElement:
+    """Tabulated boxcar passband, 20 % wide, around the pivot of `name`."""
+    center = BANDS[name.rpartition("/")[-1]]
+    wavelengths = np.linspace(0.85, 1.15, 301) * center
+    return SpectralElement(
+        Empirical1D,
+        points=wavelengths,
+        lookup_table=Box1D(amplitude=1, x_0=center, width=0.2 * center)(
+            wavelengths
+        ),
+    )
+
+
+def synthetic_vega() -> SourceSpectrum:
+    """Blackbody stand-in for the CALSPEC Vega spectrum."""
+    return SyntheticSpextrum("synthetic/vega", temperature=9600)
+
+
+def synthetic_templates(n_templates: int) -> list[SyntheticSpextrum]:
+    """`n_templates` blackbody templates from 3000 to 30000 K."""
+    return [
+        SyntheticSpextrum(temperature=temperature)
+        for temperature in np.geomspace(3000, 30000, n_templates)
+    ]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Weight-map rendering of each brightness profile."""
+
+import pytest
+from astropy import units as u
+
+from scopesim_targets.extended_source import (
+    Box,
+    Disk,
+    Ring,
+    Sersic,
+    Gaussian,
+    Flat,
+)
+
+
+PROFILES = {
+    "Box": lambda: Box(params={"x_width": 20, "y_width": 10}),
+    "Disk": lambda: Disk(params={"R_0": 15}),
+    "Ring": lambda: Ring(params={"r_in": 10, "width": 4}),
+    "Sersic": lambda: Sersic(params={"r_eff": 10, "n": 4}),
+    "Gaussian": lambda: Gaussian(params={"x_stddev": 5, "y_stddev": 3}),
+    "Flat": Flat,
+}
+
+
+def _optical_train(npix: int) -> dict:
+    return {"pixel_scale": 0.2 * u.arcsec / u.pix, "width": npix,
+            "height": npix}
+
+
+@pytest.mark.parametrize("npix", [64, 256, 1024])
+@pytest.mark.parametrize("profile", PROFILES)
+def test_render_image(benchmark, profile, npix):
+    """Each profile at its own default oversampling."""
+    tgt = PROFILES[profile]()
+    benchmark(tgt._render_image, _optical_train(npix))
+
+
+@pytest.mark.parametrize("oversample", [1, 2, 4, 10])
+@pytest.mark.parametrize("profile", ["Disk", "Sersic", "Gaussian"])
+def test_render_image_oversample(benchmark, profile, oversample):
+    tgt = PROFILES[profile]()
+    tgt._oversample = oversample
+    benchmark(tgt._render_image, _optical_train(256))
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+@pytest.mark.parametrize("npix", [256, 1024])
+def test_weightmap(benchmark, npix, dtype):
+    """Uncached render + normalization + header."""
+    tgt = PROFILES["Sersic"]()
+    benchmark(tgt._render_weightmap, _optical_train(npix), dtype=dtype)
+
+
+def test_weightmap_memmap(benchmark, tmp_path):
+    """Rendered straight into a memory-mapped FITS file."""
+    tgt = PROFILES["Sersic"]()
+    benchmark(
+        tgt._render_weightmap, _optical_train(1024), dtype="float32",
+        path=tmp_path / "weightmap.fits",
+    )
+
+
+def test_weightmap_cached(benchmark):
+    """Repeated exposure of the same profile and grid: a cache hit."""
+    tgt = PROFILES["Sersic"]()
+    benchmark(tgt._weightmap, _optical_train(1024))
+
+
+@pytest.mark.parametrize("cutout", [False, True])
+@pytest.mark.parametrize("profile", ["Disk", "Gaussian"])
+def test_weightmap_cutout(benchmark, profile, cutout):
+    """A compact profile on a 4k detector, full frame vs cutout."""
+    tgt = PROFILES[profile]()
+    benchmark(tgt._render_weightmap, _optical_train(4096), cutout)
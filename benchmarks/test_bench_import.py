@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Package import time, in a fresh interpreter each round."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize("module", [
+    "scopesim_targets",
+    "scopesim_targets.point_source",
+    "scopesim_targets.extended_source",
+    "scopesim_targets.cluster",
+])
+def test_import(benchmark, module):
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", f"import {module}"],),
+        kwargs={"check": True},
+        rounds=5,
+    )
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Point source conversion, from single stars to columnar star fields."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from scopesim_targets.point_source import Star, Binary, StarField
+
+from .synthetic import synthetic_templates
+
+
+def test_star_to_source(benchmark):
+    tgt = Star(
+        position=(2, 3),
+        spectrum=synthetic_templates(1)[0],
+        brightness=("R", 15),
+    )
+    benchmark(tgt.to_source)
+
+
+def test_binary_to_table(benchmark):
+    primary, secondary = synthetic_templates(2)
+    tgt = Binary(
+        position={"distance": 100 * u.pc},
+        spectra=(primary, secondary),
+        brightness=("R", 10),
+        contrast=100.,
+        offset={"separation": .1 * u.AU},
+    )
+    benchmark(tgt.to_table)
+
+
+def _star_field_columns(n_stars: int, n_templates: int = 20) -> dict:
+    rng = np.random.default_rng(42)
+    templates = np.empty(n_templates, dtype=object)
+    templates[:] = synthetic_templates(n_templates)
+    return {
+        "positions": {
+            "x": rng.uniform(-60, 60, n_stars),
+            "y": rng.uniform(-60, 60, n_stars),
+        },
+        "spectra": templates[rng.integers(n_templates, size=n_stars)],
+        "brightnesses": rng.uniform(10, 20, n_stars),
+        "band": "R",
+    }
+
+
+@pytest.mark.parametrize("n_stars", [10**2, 10**3, 10**4, 10**5, 10**6])
+def test_star_field_to_source(benchmark, n_stars):
+    tgt = StarField(**_star_field_columns(n_stars))
+    benchmark.pedantic(tgt.to_source, rounds=3, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("n_stars", [10**2, 10**4])
+def test_star_field_per_star_to_source(benchmark, n_stars):
+    columns = _star_field_columns(n_stars)
+    columns["brightnesses"] = list(columns["brightnesses"])
+    tgt = StarField(**columns)
+    benchmark.pedantic(tgt.to_source, rounds=3, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("n_stars", [10**4, 10**6])
+def test_star_field_init(benchmark, n_stars):
+    benchmark.pedantic(
+        StarField, kwargs=_star_field_columns(n_stars), rounds=3
+    )
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Stellar population sampling and lookup-table interpolation."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy.coordinates import SkyCoord
+
+from scopesim_targets.spectral_classes import StellarParameters
+from scopesim_targets.stellar import imf
+from scopesim_targets.stellar.populations import IMFPopulation
+from scopesim_targets.stellar import morphology
+from scopesim_targets.stellar.morphology import KingProfileMorphology
+
+
+CLUSTER_POSITION = SkyCoord(0 * u.deg, 0 * u.deg, 1 * u.kpc)
+
+
+@pytest.mark.parametrize("n_stars", [10**2, 10**4, 10**5])
+def test_imf_population_to_source_columns(benchmark, n_stars):
+    population = IMFPopulation(n_stars)
+    benchmark.pedantic(
+        population.to_source_columns, args=(CLUSTER_POSITION,), rounds=3
+    )
+
+
+@pytest.mark.parametrize("name", ["kroupa02", "chabrier03"])
+@pytest.mark.parametrize("n_stars", [10**3, 10**7])
+def test_imf_sample_masses(benchmark, name, n_stars):
+    dist = imf.DEFAULT_IMFS[name]
+    imf.sample_masses(dist, 1)  # inverse CDF set up once, outside the timing
+    benchmark.pedantic(imf.sample_masses, args=(dist, n_stars), rounds=3)
+
+
+@pytest.mark.parametrize("n_stars", [10**2, 10**4, 10**6])
+def test_king_profile_sample(benchmark, n_stars):
+    morphology = KingProfileMorphology(
+        n_stars, r_core=1 * u.pc, r_tide=10 * u.pc
+    )
+    benchmark(morphology.sample, CLUSTER_POSITION)
+
+
+@pytest.mark.parametrize(
+    "morph",
+    [
+        morphology.PlummerMorphology(10**6, r_scale=1 * u.pc),
+        morphology.EFFMorphology(10**6, r_scale=1 * u.pc, gamma=3),
+        morphology.GaussianMorphology(10**6, sigma=1 * u.pc, axis_ratio=.5),
+        morphology.FractalMorphology(10**6, radius=5 * u.pc),
+    ],
+    ids=lambda morph: type(morph).__name__,
+)
+def test_analytic_morphology_sample(benchmark, morph):
+    benchmark.pedantic(morph.sample, args=(CLUSTER_POSITION,), rounds=3)
+
+
+@pytest.mark.parametrize("n_values", [10**2, 10**4, 10**6])
+def test_stellar_parameters_interpolate(benchmark, n_values):
+    stellar_params = StellarParameters()
+    masses = np.random.default_rng(42).uniform(0.1, 20, n_values) * u.solMass
+    benchmark(stellar_params.interpolate, "mass", masses,
+              extrapolate_phot=True)
+
+
+@pytest.mark.parametrize("n_values", [10**2, 10**5])
+def test_stellar_parameters_closest_spectral_type(benchmark, n_values):
+    stellar_params = StellarParameters()
+    spectral_types = [str(spt) for spt in stellar_params.table["spectral_type"]]
+    catalogue = np.random.default_rng(42).choice(spectral_types, n_values)
+    benchmark(stellar_params.closest_spectral_type_indices, catalogue)
+
+
+def test_stellar_parameters_load(benchmark):
+    benchmark(StellarParameters)
+
+
+def test_stellar_parameters_load_table(benchmark):
+    # Process-wide table dropped before each round: read from the binary cache
+    StellarParameters()  # make sure the cache exists
+    benchmark.pedantic(
+        StellarParameters, setup=StellarParameters.clear_table_cache,
+        rounds=20,
+    )
@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
-"""Importing this package has the side-effect of adding custom YAML tags."""
+"""Importing this package has the side-effect of adding custom YAML tags.
 
+The target modules (and with them SpeXtra, synphot and ScopeSim) are only
+imported on first access, e.g. ``scopesim_targets.point_source`` or the first
+``!Star`` tag that is loaded, so that importing this package stays cheap.
+"""
+
+from importlib import import_module
 from pathlib import Path
 
 # Needs to be before the other imports to avoid circular issues.
@@ -8,28 +14,35 @@ PKG_DIR = Path(__file__).parent
 DATA_DIR = PKG_DIR.parent / "data"
 
 
-from .target import Target
-from . import point_source
-from . import extended_source
-from . import cluster
-
 from .yaml_constructors import (
     register_qty,
     register_coord,
     register_target_constructor,
 )
 
+_LAZY_SUBMODULES = {"target", "point_source", "extended_source", "cluster"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        return import_module(f".{name}", __name__)
+    if name == "Target":
+        return import_module(".target", __name__).Target
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Run YAML registrations
 register_qty()
 register_coord()
 
-register_target_constructor(point_source.Star)
-register_target_constructor(point_source.Binary)
-register_target_constructor(point_source.Exoplanet)
-register_target_constructor(point_source.PlanetarySystem)
-register_target_constructor(point_source.StarField)
+register_target_constructor("point_source.Star")
+register_target_constructor("point_source.Binary")
+register_target_constructor("point_source.Exoplanet")
+register_target_constructor("point_source.PlanetarySystem")
+register_target_constructor("point_source.StarField")
 
-register_target_constructor(extended_source.Sersic)
-register_target_constructor(extended_source.Disk)
+register_target_constructor("extended_source.Sersic")
+register_target_constructor("extended_source.Disk")
+register_target_constructor("extended_source.CompositeProfile")
 
-register_target_constructor(cluster.ZeroAgeCluster)
+register_target_constructor("cluster.ZeroAgeCluster")
@@ -16,16 +16,15 @@ future. In the context of this, there's also the not-yet-implemented
 
 from typing import Any
 from collections.abc import Mapping
+from concurrent.futures import Executor
 
 from astropy import units as u
 from astropy.table import Table
 
-from scopesim import Source
-from scopesim.source.source_fields import TableSourceField
-
-from .typing_utils import POSITION_TYPE
-from .target import Target
+from .typing_utils import POSITION_TYPE, SEED_TYPE
+from .target import Target, fov_mask
 from .stellar import populations, morphology
+from .stellar.sampling import as_seed_sequence
 
 
 # This look very much like a dataclass now...
@@ -49,7 +48,16 @@ class ZeroAgeCluster(Cluster):
         pop_params: Mapping[str, Any],
         morph_class: morphology.Morphology | str,
         morph_params: Mapping[str, Any],
+        seed: SEED_TYPE = None,
     ) -> None:
+        """Set up population and morphology from their classes and params.
+
+        If given, `seed` (anything ``np.random.SeedSequence`` accepts) makes
+        the cluster reproducible: population and morphology each get their
+        own child stream of it, unless their params set an explicit `seed`.
+        """
+        pop_seed, morph_seed = as_seed_sequence(seed).spawn(2)
+
         # Required for YAML definitions, which provide only strings...
         if isinstance(pop_class, str):
             pop_class = getattr(populations, pop_class)
@@ -58,13 +66,47 @@ class ZeroAgeCluster(Cluster):
 
         super().__init__(
             position,
-            pop_class(**pop_params),
-            morph_class(**morph_params),
+            pop_class(**({"seed": pop_seed} | dict(pop_params))),
+            morph_class(**({"seed": morph_seed} | dict(morph_params))),
+        )
+
+    def to_source(
+        self,
+        optical_train=None,
+        fov_margin: u.Quantity[u.arcsec] | float | None = None,
+        executor: Executor | None = None,
+    ):
+        """Convert to ScopeSim Source object.
+
+        If `fov_margin` is given, stars further than this outside the field of
+        view of `optical_train` are dropped right after the positions are
+        sampled, before any spectra or magnitudes are looked up for them.
+
+        If given, `executor` (e.g. a ``ProcessPoolExecutor``) samples the
+        stars in parallel chunks. For a seeded cluster, the result is the same
+        with or without it.
+        """
+        from scopesim import Source
+        from scopesim.source.source_fields import TableSourceField
+
+        src_coldict = self.morphology.to_source_columns(
+            self.position, executor=executor
         )
+        select = None
+        if fov_margin is not None:
+            if optical_train is None:
+                raise ValueError("FOV culling requires an optical_train")
+            select = fov_mask(
+                src_coldict["x"], src_coldict["y"], optical_train, fov_margin
+            )
+            src_coldict = {
+                key: column[select] for key, column in src_coldict.items()
+            }
 
-    def to_source(self, optical_train=None):
-        src_coldict, spectra = self.population.to_source_columns(self.position)
-        src_coldict.update(self.morphology.to_source_columns(self.position))
+        pop_coldict, spectra = self.population.to_source_columns(
+            self.position, select=select, executor=executor
+        )
+        src_coldict.update(pop_coldict)
 
         tbl = Table(
             data=src_coldict,
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Auxilliary functions for downloading and caching static data."""
 
+import tempfile
 from pathlib import Path
 
 import pooch
@@ -16,6 +17,10 @@ RETRIEVER = pooch.create(
 )
 RETRIEVER.load_registry(PKG_DIR / "_static/registry.txt")
 
+# Directory of the binary caches derived from data files, next to the pooch
+# cache by default. None disables them.
+BINARY_CACHE_DIR: Path | str | None = RETRIEVER.abspath
+
 
 def fetch_data_file(filename: str):
     """Load local data or fetch via pooch.
@@ -26,3 +31,35 @@ def fetch_data_file(filename: str):
     if DATA_DIR.is_dir() and (path := DATA_DIR / filename).exists():
         return path
     return RETRIEVER.fetch(filename, progressbar=True)
+
+
+def binary_cache_file(filename: str, suffix: str) -> Path | None:
+    """Path of a binary cache derived from data file `filename`.
+
+    The name contains the source file's hash -- the registry hash, or that of
+    the local file if running from a cloned repo -- so a changed data file
+    never gets a stale cache. `suffix` should include a format version of the
+    cache contents. Returns None if ``BINARY_CACHE_DIR`` is None.
+    """
+    if BINARY_CACHE_DIR is None:
+        return None
+    if DATA_DIR.is_dir() and (path := DATA_DIR / filename).exists():
+        digest = pooch.file_hash(str(path))
+    else:
+        digest = RETRIEVER.registry[filename].rpartition(":")[-1]
+    return Path(BINARY_CACHE_DIR) / f"{filename}.{digest[:16]}{suffix}"
+
+
+def partial_file(path: Path) -> Path:
+    """Create an empty, uniquely named temporary file next to `path`.
+
+    Caches are written there first and then moved onto `path` with
+    ``os.replace``, so readers never see a half-written file. The unique name
+    keeps concurrent writers (e.g. pool workers that miss on the same key)
+    from writing into the same temporary file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f"{path.name}.", suffix=".part", delete=False,
+    ) as file:
+        return Path(file.name)
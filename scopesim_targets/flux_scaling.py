@@ -9,11 +9,22 @@ band-integrated energy flux) at any locator (band, wavelength or frequency).
 
 It deliberately depends on synphot + astropy only. The two inputs that need the
 network / heavier stack -- the bandpass (a spextra ``Passband``) and the Vega
-reference spectrum -- are resolved by the caller
-(:meth:`SpectrumTarget._get_spectrum_scale`) and handed in, so this whole
-dispatch is unit-testable offline against real synphot.
+reference spectrum, or the band's precomputed :func:`zero_point_flux` in its
+place -- are resolved by the caller (:meth:`SpectrumTarget._get_spectrum_scale`)
+and handed in, so this whole dispatch is unit-testable offline against real
+synphot.
+
+For many targets sharing a band (star fields, clusters),
+:func:`batch_flux_scale` exploits that every scale is the product of a
+per-template factor (one synphot integration) and a per-target factor that only
+depends on the stated amount, so N targets cost one integration per unique
+template instead of N.
 """
 
+from dataclasses import replace
+from collections.abc import Mapping
+
+import numpy as np
 import astropy.units as u
 from synphot import Observation, units
 from synphot.units import VEGAMAG
@@ -25,7 +36,7 @@ from .brightness import (
     AmountError,
 )
 
-__all__ = ["synphot_flux_scale"]
+__all__ = ["synphot_flux_scale", "batch_flux_scale", "zero_point_flux"]
 
 
 _SYSTEM_UNIT = {
@@ -35,7 +46,48 @@ _SYSTEM_UNIT = {
 }
 
 
-def synphot_flux_scale(spectrum, brightness, *, band=None, vegaspec=None):
+def zero_point_flux(band, system, *, vegaspec=None) -> u.Quantity:
+    """Band-averaged flux density of a 0 mag source in `system` [FLAM].
+
+    Expressed in the same band average synphot uses for ``effstim(FLAM)``, so
+    ``m = -2.5 log10(effstim_FLAM / zero_point)`` reproduces synphot's
+    ``effstim`` in every system: ST is band-independent, AB depends on the
+    band only through its pivot wavelength (the point synphot converts at),
+    and Vega is the band-averaged Vega flux (the ratio synphot forms for
+    ``VEGAMAG``). Depends on the band only, so callers can compute it once per
+    band and reuse it for any number of spectra.
+
+    Parameters
+    ----------
+    band : synphot.SpectralElement
+        The bandpass.
+    system : .brightness.PhotometricSystem
+        The magnitude system.
+    vegaspec : synphot.SourceSpectrum, optional
+        Vega reference spectrum; required only for the VEGA system.
+
+    Returns
+    -------
+    astropy.units.Quantity
+        The zero-point flux density in FLAM.
+    """
+    if system is PhotometricSystem.VEGA:
+        if vegaspec is None:
+            raise ValueError("a Vega zero point requires the Vega spectrum")
+        return Observation(vegaspec, band).effstim(units.FLAM)
+    if system is PhotometricSystem.AB:
+        return units.convert_flux(band.pivot(), 0 * u.ABmag, units.FLAM)
+    return (0 * u.STmag).to(units.FLAM)
+
+
+def synphot_flux_scale(
+    spectrum,
+    brightness,
+    *,
+    band=None,
+    vegaspec=None,
+    zero_point=None,
+):
     """Dimensionless factor so that `spectrum * factor` matches `brightness`.
 
     Parameters
@@ -51,7 +103,13 @@ def synphot_flux_scale(spectrum, brightness, *, band=None, vegaspec=None):
         Bandpass for a BAND locator. Required for BAND locators and for any
         magnitude amount.
     vegaspec : synphot.SourceSpectrum, optional
-        Vega reference spectrum; required only for VEGA-system magnitudes.
+        Vega reference spectrum; required only for VEGA-system magnitudes
+        without a `zero_point`.
+    zero_point : astropy.units.Quantity, optional
+        Precomputed :func:`zero_point_flux` of `band` in the magnitude's
+        system. If given, a magnitude costs one band average of `spectrum`
+        instead of a full ``effstim`` in the magnitude system (which, for
+        Vega, integrates the reference spectrum again every time).
 
     Returns
     -------
@@ -62,6 +120,14 @@ def synphot_flux_scale(spectrum, brightness, *, band=None, vegaspec=None):
     if brightness.amount_kind is AmountKind.MAG:
         if band is None:
             raise ValueError("a magnitude amount requires a resolved band")
+        if zero_point is not None:
+            ratio = Observation(spectrum, band).effstim(units.FLAM) / zero_point
+            m_actual = -2.5 * np.log10(
+                ratio.to_value(u.dimensionless_unscaled)
+            )
+            delta = brightness.value.to_value(u.mag) - m_actual
+            return float(10 ** (-0.4 * delta))
+
         system_unit = _SYSTEM_UNIT[brightness.system]
         extra = (
             {"vegaspec": vegaspec}
@@ -98,3 +164,78 @@ def synphot_flux_scale(spectrum, brightness, *, band=None, vegaspec=None):
     wavelength = brightness.locator.to(u.AA, u.spectral())
     actual = spectrum(wavelength, flux_unit=brightness.value.unit)
     return float((brightness.value / actual).to_value(u.dimensionless_unscaled))
+
+
+def batch_flux_scale(
+    spectra,
+    refs,
+    values,
+    brightness,
+    *,
+    band=None,
+    vegaspec=None,
+    zero_point=None,
+):
+    """Vector of scale factors for many targets sharing one brightness form.
+
+    Every target ``i`` is described by the template ``spectra[refs[i]]`` and
+    the amount ``values[i]``; everything else (locator, amount kind, system,
+    unit) is shared and taken from `brightness`. The scale separates into a
+    template term and an amount term:
+
+    * magnitude: ``10**(-0.4 * m_i) * 10**(0.4 * m_actual(template))``;
+    * linear amount: ``value_i * 1 / actual(template)``.
+
+    The template term is :func:`synphot_flux_scale` of the reference amount
+    (0 mag or 1 unit), evaluated once per unique ref; the amount term is pure
+    NumPy. The result is identical to calling :func:`synphot_flux_scale` per
+    target, up to floating-point rounding.
+
+    Parameters
+    ----------
+    spectra : Mapping[int, synphot.SourceSpectrum]
+        Resolved template spectra, keyed by ref.
+    refs : array_like of int
+        Template ref of each target.
+    values : array_like or astropy.units.Quantity
+        Amount of each target. Bare numbers are taken to be in the unit of
+        ``brightness.value`` (``mag`` for magnitudes).
+    brightness : .brightness.Brightness
+        Any one brightness of the group; its ``value`` is ignored.
+    band, vegaspec, zero_point
+        As for :func:`synphot_flux_scale`.
+
+    Returns
+    -------
+    numpy.ndarray
+        The multiplicative scale factor of each target.
+    """
+    if not isinstance(spectra, Mapping):
+        raise TypeError("spectra must be a mapping of ref to spectrum")
+
+    unit = brightness.value.unit
+    refs = np.asarray(refs)
+    values = u.Quantity(values, unit).to_value(unit)
+    if refs.shape != values.shape:
+        raise ValueError("refs and values must have the same shape")
+
+    # Reference amount: the template term is the scale for 0 mag or 1 unit.
+    if brightness.amount_kind is AmountKind.MAG:
+        reference = replace(brightness, value=0 * u.mag)
+        amount_factors = 10 ** (-0.4 * values)
+    else:
+        reference = replace(brightness, value=1 * unit)
+        amount_factors = values
+
+    unique_refs, inverse = np.unique(refs, return_inverse=True)
+    template_factors = np.array([
+        synphot_flux_scale(
+            spectra[ref],
+            reference,
+            band=band,
+            vegaspec=vegaspec,
+            zero_point=zero_point,
+        )
+        for ref in unique_refs.tolist()
+    ])
+    return template_factors[inverse.reshape(refs.shape)] * amount_factors
@@ -1,22 +1,25 @@
 # -*- coding: utf-8 -*-
 """Currently only ``Star`` and baseclass."""
 
-from collections.abc import Sequence, Mapping
-from itertools import count
+from collections.abc import Iterator, Sequence, Mapping
+from dataclasses import replace
+from typing import TYPE_CHECKING
 
-from more_itertools import unzip
+import numpy as np
 from astropy import units as u
 from astropy.table import Table
-from astropy.coordinates import SkyCoord
+from astropy.coordinates import SkyCoord, Distance
+from astropy.utils.masked import Masked
 from synphot import SourceSpectrum
 
 from astar_utils.guard_functions import guard_same_len
-from spextra import Spextrum
-from scopesim import Source
-from scopesim.source.source_fields import TableSourceField
 
 from .typing_utils import POSITION_TYPE, SPECTRUM_TYPE, BRIGHTNESS_TYPE
-from .target import Brightness, SpectrumTarget
+from .target import Brightness, SpectrumTarget, fov_mask
+
+if TYPE_CHECKING:
+    from scopesim import Source
+    from scopesim.source.source_fields import TableSourceField
 
 
 class PointSourceTarget(SpectrumTarget):
@@ -38,8 +41,11 @@ class PointSourceTarget(SpectrumTarget):
         if anchor is not None:
             self.anchor = anchor
 
-    def to_source(self, optical_train=None) -> Source:
+    def to_source(self, optical_train=None) -> "Source":
         """Convert to ScopeSim Source object."""
+        from scopesim import Source
+        from scopesim.source.source_fields import TableSourceField
+
         source = Source(
             field=TableSourceField(
                 self.to_table(), spectra=self.source_spectra()
@@ -69,6 +75,32 @@ class PointSourceTarget(SpectrumTarget):
         tbl.meta["y_unit"] = "arcsec"
         return tbl
 
+    @staticmethod
+    def _xy_arcsec_positions(
+        positions: Sequence[SkyCoord] | SkyCoord,
+        local_frame,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized :meth:`_xy_arcsec_position` for many positions.
+
+        An array-valued ``SkyCoord`` is transformed in one go. A sequence of
+        scalar ``SkyCoord`` objects is stacked first, falling back to a
+        per-position transform only if they can't be combined (mixed frames,
+        or some with and some without distance).
+        """
+        if not isinstance(positions, SkyCoord):
+            try:
+                positions = np.stack(positions)
+            except (ValueError, TypeError):
+                xy_positions = [
+                    PointSourceTarget._xy_arcsec_position(position, local_frame)
+                    for position in positions
+                ]
+                return (
+                    np.array([x_arcsec for x_arcsec, _ in xy_positions]),
+                    np.array([y_arcsec for _, y_arcsec in xy_positions]),
+                )
+        return PointSourceTarget._xy_arcsec_position(positions, local_frame)
+
     @staticmethod
     def _xy_arcsec_position(position, local_frame) -> tuple[float, float]:
         # Transform to local offset for ScopeSim
@@ -436,7 +468,7 @@ class Exoplanet(PointSourceTarget):
             return self._spectrum
         except AttributeError:
             pass
-        return Spextrum("irtf/Neptune")
+        return self.resolve_spectrum("spex:irtf/Neptune")
 
     @spectrum.setter
     def spectrum(self, spectrum: SPECTRUM_TYPE):
@@ -481,8 +513,11 @@ class PlanetarySystem(PointSourceTarget):
         if components is not None:
             self.components = components
 
-    def to_source(self, optical_train=None) -> Source:
+    def to_source(self, optical_train=None) -> "Source":
         """Convert to ScopeSim Source object."""
+        from scopesim import Source
+        from scopesim.source.source_fields import TableSourceField
+
         local_frame = self.position.skyoffset_frame()
 
         # HACK: Should be able to pass this down
@@ -523,6 +558,18 @@ class StarField(PointSourceTarget):
     .. todo:: Add support for defining a common (field center) position to which
         the individual positions are interpreted als relative to.
 
+    Besides per-star sequences, all three attributes accept whole columns,
+    which are processed without any per-star Python work in :meth:`to_source`
+    (one vectorized frame transform and one batched weight computation):
+
+    * ``positions`` -- an array-valued ``SkyCoord``, an ``(N, 2)`` array of
+      x/y offsets [arcsec], or a mapping of ``x``/``y`` (optionally
+      ``distance``) or ``ra``/``dec`` arrays;
+    * ``spectra`` -- any sequence or array of spectrum identifiers (parsed once
+      per unique value);
+    * ``brightnesses`` -- a numeric array or ``Quantity`` array of amounts in
+      ``band`` (bare numbers are magnitudes).
+
     Examples
     --------
     >>> tgt = StarField(
@@ -532,6 +579,15 @@ class StarField(PointSourceTarget):
     ...     band="V",  # default for brightnesses
     ... )
 
+    The same field in columnar form:
+
+    >>> tgt = StarField(
+    ...     positions={"x": np.array([0, 1]), "y": np.array([0, 1])},
+    ...     spectra=np.array(["A0V", "G2V"]),
+    ...     brightnesses=np.array([10, 15]),
+    ...     band="V",
+    ... )
+
     For more examples, see also
     `the YAML syntax <../yaml_syntax.html#star-field>`_.
 
@@ -539,57 +595,121 @@ class StarField(PointSourceTarget):
 
     def __init__(
         self,
-        positions: Sequence[POSITION_TYPE] | None = None,
+        positions: Sequence[POSITION_TYPE] | SkyCoord | None = None,
         spectra: Sequence[SPECTRUM_TYPE] | None = None,
-        brightnesses: Sequence[BRIGHTNESS_TYPE] | None = None,
+        brightnesses: Sequence[BRIGHTNESS_TYPE] | np.ndarray | None = None,
         band: str | None = None,  # TODO: Proper typing
     ) -> None:
-        guard_same_len(positions, spectra, brightnesses)
         self.band = band
-        self.positions = positions
-        self.spectra = spectra
-        self.brightnesses = brightnesses
+        # Length consistency is checked by each setter against the others.
+        if positions is not None:
+            self.positions = positions
+        if spectra is not None:
+            self.spectra = spectra
+        if brightnesses is not None:
+            self.brightnesses = brightnesses
+
+    def _guard_lengths(self, attribute: str, **columns) -> None:
+        """Raise if the (new) column lengths don't match the existing ones."""
+        current = {
+            "positions": getattr(self, "_positions", None),
+            "spectra": getattr(self, "_spectrum_refs", None),
+            "brightnesses": self._brightness_column(
+                getattr(self, "_brightnesses", None)
+            ),
+        }
+        current.update(columns)
+        try:
+            guard_same_len(*current.values())
+        except ValueError as err:
+            raise ValueError(
+                f"{attribute} length doesn't match other attributes"
+            ) from err
+
+    @staticmethod
+    def _brightness_column(brightnesses):
+        """Length-carrying view of per-star or columnar brightnesses."""
+        if isinstance(brightnesses, Brightness):
+            return brightnesses.value
+        return brightnesses
 
     @property
-    def positions(self):
+    def positions(self) -> list[SkyCoord] | SkyCoord | None:
+        """Star positions, per star (list) or columnar (array ``SkyCoord``)."""
         try:
             return self._positions
         except AttributeError:
             pass  # return None
 
     @positions.setter
-    def positions(self, positions: Sequence[POSITION_TYPE]):
-        try:
-            guard_same_len(positions, self.spectra, self.brightnesses)
-        except ValueError as err:
-            raise ValueError(
-                "Positions length doesn't match other attributes"
-            ) from err
-        self._positions = [
-            self._parse_position(position) for position in positions
-        ]
+    def positions(self, positions):
+        positions = self._parse_positions(positions)
+        self._guard_lengths("Positions", positions=positions)
+        self._positions = positions
+
+    def _parse_positions(self, positions) -> list[SkyCoord] | SkyCoord:
+        match positions:
+            case SkyCoord() if not positions.isscalar:
+                return positions
+            case {"ra": ra, "dec": dec, **rest}:
+                distance = rest.get("distance")
+                if distance is not None:
+                    distance = Distance(np.atleast_1d(distance))
+                return SkyCoord(np.atleast_1d(ra) << u.deg,
+                                np.atleast_1d(dec) << u.deg,
+                                distance=distance)
+            case {"x": x_arcsec, "y": y_arcsec, **rest}:
+                return self._parse_position({
+                    "x": np.atleast_1d(x_arcsec),
+                    "y": np.atleast_1d(y_arcsec),
+                    **rest,
+                })
+            case np.ndarray() if positions.ndim == 2:
+                x_arcsec, y_arcsec = positions.T
+                return self._parse_position((x_arcsec, y_arcsec))
+            case _:
+                return [
+                    self._parse_position(position) for position in positions
+                ]
 
     @property
-    def spectra(self):
+    def spectra(self) -> list[SPECTRUM_TYPE] | None:
+        """Parsed spectrum of each star."""
         try:
-            return self._spectra
+            refs = self._spectrum_refs
         except AttributeError:
-            pass  # return None
+            return None
+        return [self._unique_spectra[ref] for ref in refs]
 
     @spectra.setter
     def spectra(self, spectra: Sequence[SPECTRUM_TYPE]):
-        try:
-            guard_same_len(self.positions, spectra, self.brightnesses)
-        except ValueError as err:
-            raise ValueError(
-                "Spectra length doesn't match other attributes"
-            ) from err
-        self._spectra = [
-            self._parse_spectrum(spectrum) for spectrum in spectra
-        ]
+        # Parse each distinct identifier once, then merge identifiers that
+        # parse to the same spectrum (e.g. "G2V" and "g2v").
+        raw_refs: dict = {}
+        refs = np.fromiter(
+            (raw_refs.setdefault(spectrum, len(raw_refs))
+             for spectrum in spectra),
+            dtype=int,
+            count=len(spectra),
+        )
+        unique: dict = {}
+        remap = np.array([
+            unique.setdefault(self._parse_spectrum(spectrum), len(unique))
+            for spectrum in raw_refs
+        ], dtype=int)
+        refs = remap[refs]
+
+        self._guard_lengths("Spectra", spectra=refs)
+        self._spectrum_refs = refs
+        self._unique_spectra = list(unique)
 
     @property
-    def brightnesses(self):
+    def brightnesses(self) -> list[Brightness] | Brightness | None:
+        """Brightness of each star.
+
+        Either a list with one :class:`~.brightness.Brightness` per star, or --
+        in columnar mode -- a single ``Brightness`` with an array ``value``.
+        """
         try:
             return self._brightnesses
         except AttributeError:
@@ -597,54 +717,308 @@ class StarField(PointSourceTarget):
 
     @brightnesses.setter
     def brightnesses(self, brightnesses: Sequence[BRIGHTNESS_TYPE]):
-        try:
-            guard_same_len(self.positions, self.spectra, brightnesses)
-        except ValueError as err:
-            raise ValueError(
-                "Brightnesses length doesn't match other attributes"
-            ) from err
-        self._brightnesses = [
-            (
-                self._parse_brightness(brightness)
-                if isinstance(brightness, Sequence) and len(brightness) > 1
-                else self._parse_brightness((self.band, brightness))
+        if (
+            isinstance(brightnesses, np.ndarray)  # includes Quantity
+            and brightnesses.ndim == 1
+            and brightnesses.dtype.kind in "iuf"
+        ):
+            if not isinstance(brightnesses, u.Quantity):
+                brightnesses = brightnesses << u.mag
+            parsed = self._parse_brightness((self.band, brightnesses))
+        else:
+            parsed = [
+                (
+                    self._parse_brightness(brightness)
+                    if isinstance(brightness, Brightness) or (
+                        isinstance(brightness, Sequence) and len(brightness) > 1
+                    )
+                    else self._parse_brightness((self.band, brightness))
+                )
+                for brightness in brightnesses
+            ]
+        self._guard_lengths(
+            "Brightnesses", brightnesses=self._brightness_column(parsed)
+        )
+        self._brightnesses = parsed
+
+    @classmethod
+    def from_table(
+        cls,
+        table: Table | np.ndarray,
+        columns: Mapping[str, str] | None = None,
+        band: str | None = None,
+    ) -> "StarField":
+        """Build a columnar star field from a catalog table.
+
+        Parameters
+        ----------
+        table : astropy.table.Table | numpy.ndarray
+            Catalog with one row per star. A NumPy structured array (e.g. one
+            opened with ``np.load(..., mmap_mode="r")``) is wrapped without
+            copying.
+        columns : Mapping[str, str] | None, optional
+            Maps the fields ``x``, ``y`` (offsets, arcsec if unitless) or
+            ``ra``, ``dec`` (deg if unitless), and ``distance``, ``spectrum``,
+            ``brightness`` (magnitudes if unitless) and ``band`` to column
+            names in `table`. Unmapped fields default to a column of the same
+            name; ``distance`` and ``band`` are optional.
+        band : str | None, optional
+            Band of the ``brightness`` column, if there is no ``band`` column.
+
+        Bands and spectra are validated once per unique value, not per row.
+
+        Returns
+        -------
+        StarField
+
+        Raises
+        ------
+        ValueError
+            If a required column is missing or any used column has masked
+            entries.
+        """
+        if not isinstance(table, Table):
+            table = Table(table, copy=False)
+        columns = {
+            field: field for field in (
+                "x", "y", "ra", "dec", "distance", "spectrum", "brightness",
+                "band",
             )
-            for brightness in brightnesses
-        ]
+        } | dict(columns or {})
+
+        def column(field: str, required: bool = False):
+            if (name := columns[field]) not in table.colnames:
+                if required:
+                    raise ValueError(
+                        f"Table has no column {name!r} for {field!r}."
+                    )
+                return None
+            col = table[name]
+            if np.any(getattr(col, "mask", False)):
+                raise ValueError(
+                    f"Column {name!r} has masked entries, which would render "
+                    "as stars at their fill values. Remove those rows first."
+                )
+            if isinstance(col, Masked):
+                col = col.unmasked
+            if isinstance(col, u.Quantity):
+                return col
+            values = np.asarray(col)
+            if getattr(col, "unit", None) is not None:
+                # Via `<<` so function units (e.g. ABmag) become Magnitude.
+                return values << col.unit
+            if values.dtype.kind == "S":  # e.g. FITS string columns
+                values = np.char.decode(values)
+            if values.dtype.kind == "U":
+                values = np.char.strip(values)
+            return values
+
+        if columns["x"] in table.colnames:
+            positions = {
+                "x": column("x"), "y": column("y", required=True),
+            }
+        else:
+            positions = {
+                "ra": column("ra", required=True),
+                "dec": column("dec", required=True),
+            }
+        if (distance := column("distance")) is not None:
+            positions["distance"] = distance
 
-    def to_source(self, optical_train=None) -> Source:
-        """Convert to ScopeSim Source object."""
-        local_frame = SkyCoord(0 * u.deg, 0 * u.deg).skyoffset_frame()
+        field = cls(
+            positions=positions,
+            spectra=column("spectrum", required=True),
+            band=band,
+        )
 
-        xy_positions = []
-        for position in self.positions:
-            xy_positions.append(
-                self._xy_arcsec_position(position, local_frame)
+        brightnesses = column("brightness", required=True)
+        if not isinstance(brightnesses, u.Quantity):
+            brightnesses = brightnesses << u.mag
+        if (bands := column("band")) is None:
+            field.brightnesses = brightnesses
+            return field
+
+        unique_bands, band_index = np.unique(bands, return_inverse=True)
+        if len(unique_bands) == 1:
+            field.band = str(unique_bands[0])
+            field.brightnesses = brightnesses
+            return field
+
+        # Several bands: parse the amounts and validate each band once, then
+        # combine them per star.
+        column_brightness = cls._parse_brightness(
+            (str(unique_bands[0]), brightnesses)
+        )
+        templates = [
+            cls._parse_brightness(replace(column_brightness, locator=str(name)))
+            for name in unique_bands
+        ]
+        unit = column_brightness.value.unit
+        field.brightnesses = [
+            replace(templates[index], value=amount * unit)
+            for index, amount in zip(
+                band_index.tolist(), column_brightness.value.value.tolist()
             )
+        ]
+        return field
 
-        x_positions, y_positions = unzip(xy_positions)
+    @classmethod
+    def from_ecsv(cls, path, **kwargs) -> "StarField":
+        """Build a columnar star field from an ECSV catalog file.
 
-        spectra_ids = dict(zip(set(self.spectra), count()))
-        resolved_spectra = {
-            # TODO: Implement redshift from position.
-            spectrum_id: self.resolve_spectrum(spectrum)
-            for spectrum, spectrum_id in spectra_ids.items()
-        }
+        Keyword arguments are passed on to :meth:`from_table`.
+        """
+        return cls.from_table(Table.read(path, format="ascii.ecsv"), **kwargs)
 
-        spec_refs = [spectra_ids[spectrum] for spectrum in self.spectra]
-        weights = [
-            self._anchored_spectrum_scale(resolved_spectra[spectrum_id], brightness)
-            for spectrum_id, brightness in zip(spec_refs, self.brightnesses)
-        ]
+    @classmethod
+    def from_fits(cls, path, hdu: int | str = 1, **kwargs) -> "StarField":
+        """Build a columnar star field from a (memory-mapped) FITS table.
+
+        Keyword arguments are passed on to :meth:`from_table`.
+        """
+        table = Table.read(path, format="fits", hdu=hdu, memmap=True)
+        return cls.from_table(table, **kwargs)
+
+    @classmethod
+    def from_parquet(cls, path, **kwargs) -> "StarField":
+        """Build a columnar star field from a Parquet catalog file.
+
+        Requires ``pyarrow``. Keyword arguments are passed on to
+        :meth:`from_table`.
+        """
+        return cls.from_table(Table.read(path, format="parquet"), **kwargs)
+
+    def to_source(
+        self,
+        optical_train=None,
+        fov_margin: u.Quantity[u.arcsec] | float | None = None,
+    ) -> "Source":
+        """Convert to ScopeSim Source object.
+
+        Parameters
+        ----------
+        optical_train : optional
+            Only needed for FOV culling (see `fov_margin`).
+        fov_margin : u.Quantity[u.arcsec] | float | None, optional
+            If given, stars further than this outside the field of view of
+            `optical_train` are dropped before any spectra are resolved or
+            weights computed. The default (None) keeps all stars.
+
+        Returns
+        -------
+        Source
+        """
+        from scopesim import Source
+
+        field = self._to_source_field(
+            {}, slice(None), optical_train, fov_margin
+        )
+        return Source(field=field)
+
+    def iter_sources(
+        self,
+        chunk_size: int = 100_000,
+        optical_train=None,
+        fov_margin: u.Quantity[u.arcsec] | float | None = None,
+    ) -> Iterator["Source"]:
+        """Convert to ScopeSim Source objects of at most `chunk_size` stars.
+
+        Only one chunk's table and weights are held in memory at a time, so
+        very large fields can be consumed tile by tile. All chunks share the
+        same ``spectra`` dict (each spectrum is resolved on first use), so the
+        ``ref`` ids are globally consistent and the chunks can be combined
+        again with ``+``.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            Maximum number of stars per yielded Source. The default is 100_000.
+        optical_train, fov_margin : optional
+            FOV culling as in :meth:`to_source`, applied per chunk (so chunks
+            may come out smaller, or empty).
+
+        Yields
+        ------
+        Source
+            One Source with a single ``TableSourceField`` per chunk.
+        """
+        from scopesim import Source
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        resolved_spectra = {}
+        for start in range(0, len(self._spectrum_refs), chunk_size):
+            rows = slice(start, start + chunk_size)
+            yield Source(field=self._to_source_field(
+                resolved_spectra, rows, optical_train, fov_margin
+            ))
+
+    @staticmethod
+    def _take_brightnesses(brightnesses, rows):
+        """Select `rows` from per-star or columnar brightnesses."""
+        if isinstance(brightnesses, Brightness):
+            return replace(brightnesses, value=brightnesses.value[rows])
+        if isinstance(rows, slice):
+            return brightnesses[rows]
+        return [brightnesses[row] for row in rows]
+
+    def _to_source_field(
+        self,
+        resolved_spectra: dict[int, SourceSpectrum],
+        rows: slice,
+        optical_train=None,
+        fov_margin: u.Quantity[u.arcsec] | float | None = None,
+    ) -> "TableSourceField":
+        """Build the ``TableSourceField`` for the stars in `rows`.
+
+        Spectra used by these stars that are missing from `resolved_spectra`
+        are resolved and added to it in place.
+        """
+        from scopesim.source.source_fields import TableSourceField
+
+        local_frame = SkyCoord(0 * u.deg, 0 * u.deg).skyoffset_frame()
+        x_positions, y_positions = self._xy_arcsec_positions(
+            self.positions[rows], local_frame
+        )
+        refs = self._spectrum_refs[rows]
+        brightnesses = self._take_brightnesses(self.brightnesses, rows)
+
+        if fov_margin is not None:
+            if optical_train is None:
+                raise ValueError("FOV culling requires an optical_train")
+            inside = np.flatnonzero(fov_mask(
+                x_positions, y_positions, optical_train, fov_margin
+            ))
+            x_positions = x_positions[inside]
+            y_positions = y_positions[inside]
+            refs = refs[inside]
+            brightnesses = self._take_brightnesses(brightnesses, inside)
+
+        drawn_refs = np.unique(refs).tolist()
+        if not drawn_refs and not resolved_spectra:
+            # ScopeSim rejects table fields without spectra, so an empty
+            # selection still gets one (unreferenced) template.
+            drawn_refs = [0]
+        for ref in drawn_refs:
+            if ref not in resolved_spectra:
+                # TODO: Implement redshift from position.
+                resolved_spectra[ref] = self.resolve_spectrum(
+                    self._unique_spectra[ref]
+                )
+
+        # One synphot integration per unique (template, band), not per star.
+        weights = self._anchored_spectrum_scales(
+            resolved_spectra, refs, brightnesses
+        )
 
         # TODO: Refactor...
         table = Table(
             names=["x", "y", "ref", "weight"],
             units={"x": u.arcsec, "y": u.arcsec},
             data={
-                "x": list(x_positions),
-                "y": list(y_positions),
-                "ref": spec_refs,
+                "x": x_positions,
+                "y": y_positions,
+                "ref": refs,
                 "weight": weights,
             },
         )
@@ -653,4 +1027,4 @@ class StarField(PointSourceTarget):
         table.meta["x_unit"] = "arcsec"
         table.meta["y_unit"] = "arcsec"
 
-        return Source(field=TableSourceField(table, spectra=resolved_spectra))
+        return TableSourceField(table, spectra=resolved_spectra)
@@ -5,13 +5,18 @@
 
 """
 
+import os
+import json
 from typing import Any, NamedTuple
+from zipfile import BadZipFile
 from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from pathlib import Path
+from functools import lru_cache
+from copy import copy
 
 from more_itertools import always_iterable
 import numpy as np
-from numpy.lib.recfunctions import structured_to_unstructured
 from scipy.spatial import KDTree
 from scipy.interpolate import PchipInterpolator, CubicSpline
 from astropy import units as u
@@ -20,9 +25,14 @@ from astropy.utils.masked import Masked, combine_masks
 
 from astar_utils import SpectralType
 
+from . import data_utils
 from .data_utils import fetch_data_file
 
 
+# Part of the binary table cache's file name: bump whenever the processing in
+# _parse_table or the cache layout changes, so stale caches are not read.
+_TABLE_CACHE_FORMAT = 2
+
 _temperature_type = u.get_physical_type("temperature")
 TeffRange = NamedTuple("TeffRange", [
     ("min", u.Quantity[_temperature_type] | float),
@@ -81,6 +91,190 @@ class SpectralClass:
         return cls(name, teff_range, cls.colors.get(name, cls._fallback_color))
 
 
+@lru_cache(maxsize=None)
+def _load_table(filename: str) -> QTable:
+    """
+    Load and prepare Mamajek table, once per process.
+
+    Read from the binary cache (see :func:`_read_table_cache`) if there is
+    one, otherwise parsed from the ECSV file and then cached. The column data
+    are made read-only, as they are shared by all :class:`StellarParameters`
+    instances.
+
+    Returns
+    -------
+    mamajek_redux : QTable
+        Reduced Mamajek table.
+
+    """
+    cache = data_utils.binary_cache_file(
+        filename, f".v{_TABLE_CACHE_FORMAT}.npz"
+    )
+    mamajek_redux = None
+    if cache is not None and cache.exists():
+        try:
+            mamajek_redux = _read_table_cache(cache)
+        except (OSError, KeyError, ValueError, BadZipFile):
+            pass  # unreadable, replaced below
+    if mamajek_redux is None:
+        mamajek_redux = _parse_table(filename)
+        if cache is not None:
+            _write_table_cache(mamajek_redux, cache)
+
+    mamajek_redux.add_index("spectral_type", unique=True)
+    for column in mamajek_redux.itercols():
+        column.flags.writeable = False
+        if isinstance(mask := getattr(column, "mask", None), np.ndarray):
+            mask.flags.writeable = False
+
+    return mamajek_redux
+
+
+def _parse_table(filename: str) -> QTable:
+    """Parse the ECSV file and reduce it to the used columns.
+
+    Can't directly load as QTable because of logarithmic units.
+    """
+    mamajek_full = Table.read(fetch_data_file(filename))
+
+    mamajek_redux = QTable(mamajek_full[[
+        "spectral_type",
+        "teff",
+        "mass",
+        "radius",
+
+        "M_V",
+        "M_J",
+        "M_Ks",
+
+        "U-B",
+        "B-V",
+        "V-Ks",
+        "J-H",
+        "H-Ks",
+    ]])
+
+    # Convert primary key column to SpectralType objects
+    mamajek_redux["spectral_type"] = [
+        SpectralType(spectype)
+        for spectype in mamajek_redux["spectral_type"]
+    ]
+    return mamajek_redux
+
+
+def _write_table_cache(table: QTable, path: Path) -> None:
+    """Store `table` as plain arrays in an ``.npz`` file.
+
+    Read back by :func:`_read_table_cache`. Failing to write (e.g. a read-only
+    cache directory) is not an error, the table is then parsed again in the
+    next process.
+    """
+    arrays = {
+        "colnames": np.array(table.colnames),
+        # JSON rather than a pickled dict, so loading needs no allow_pickle
+        "meta": np.array(json.dumps(dict(table.meta))),
+        "units": np.array([str(col.unit or "") for col in table.itercols()]),
+        # Pre-encoded SpectralType strings, parsed without regex on reading
+        "spectral_type": np.array(
+            [str(spt) for spt in table["spectral_type"]]
+        ),
+    }
+    for name, column in table.columns.items():
+        if name == "spectral_type":
+            continue
+        arrays[f"{name}.data"] = getattr(column, "unmasked", column).value
+        if (mask := getattr(column, "mask", None)) is not None:
+            arrays[f"{name}.mask"] = mask
+
+    partial = None
+    try:
+        # Unique name, so concurrent first imports don't clobber each other
+        partial = data_utils.partial_file(path)
+        with partial.open("wb") as file:
+            np.savez(file, **arrays)
+        os.replace(partial, path)
+    except OSError:
+        if partial is not None:
+            partial.unlink(missing_ok=True)
+
+
+def _read_table_cache(path: Path) -> QTable:
+    """Rebuild the reduced table from its ``.npz`` cache."""
+    with np.load(path, allow_pickle=False) as arrays:
+        columns = {}
+        for name, unit in zip(arrays["colnames"], arrays["units"]):
+            if name == "spectral_type":
+                columns[name] = [
+                    SpectralType(spt) for spt in arrays["spectral_type"]
+                ]
+                continue
+            data = arrays[f"{name}.data"] * u.Unit(unit)
+            if f"{name}.mask" in arrays:
+                data = Masked(data, mask=arrays[f"{name}.mask"])
+            columns[str(name)] = data
+        meta = json.loads(str(arrays["meta"]))
+    return QTable(columns, meta=meta)
+
+
+@lru_cache(maxsize=None)
+def _shared_instance(cls, required_columns: tuple[str, ...] | None):
+    """Process-wide instance, see :meth:`StellarParameters.shared`."""
+    return cls(required_columns)
+
+
+@lru_cache(maxsize=1024)
+def _spectral_type_code(spectype: SpectralType | str) -> tuple[float, float]:
+    """Numerical (spectral, luminosity) class pair of one spectral type."""
+    spectype = SpectralType(spectype)
+    return (
+        spectype.numerical_spectral_class,
+        float(spectype.numerical_luminosity_class),
+    )
+
+
+def spectral_type_codes(
+    spectral_types: SpectralType | str | Iterable[SpectralType | str],
+) -> np.ndarray:
+    """
+    Convert spectral type(s) to numerical codes in bulk.
+
+    Each spectral type becomes a ``(numerical_spectral_class,
+    numerical_luminosity_class)`` pair (see ``astar_utils.SpectralType``).
+    Only the distinct values are parsed (and cached across calls), so a
+    catalogue of many stars with few distinct spectral types converts at
+    array speed.
+
+    Parameters
+    ----------
+    spectral_types : SpectralType | str | Iterable[SpectralType | str]
+        Spectral type(s) to convert. Arrays of strings are deduplicated with
+        ``np.unique``, other iterables via a dict.
+
+    Returns
+    -------
+    codes : np.ndarray
+        Float array of shape ``(N, 2)``.
+
+    """
+    if isinstance(spectral_types, (str, SpectralType)):
+        spectral_types = [spectral_types]
+    values = np.asarray(spectral_types)
+    if values.dtype.kind in "US":
+        distinct, inverse = np.unique(values.ravel(), return_inverse=True)
+    else:
+        lookup: dict[Any, int] = {}
+        inverse = np.fromiter(
+            (lookup.setdefault(value, len(lookup)) for value in values.flat),
+            dtype=np.intp,
+            count=values.size,
+        )
+        distinct = list(lookup)
+    codes = np.array(
+        [_spectral_type_code(value) for value in distinct], dtype=float
+    ).reshape(-1, 2)
+    return codes[inverse]
+
+
 def teff_range_overlap(*teff_ranges) -> TeffRange:
     """
     Return overlap between `teff_ranges`.
@@ -189,15 +383,14 @@ class StellarParameters:
             colname: column.unit
             for colname, column in self.table.columns.items()
         }
-
-        self._closest_indices: dict[str, Any] = {}
-        self._lookup_tree: KDTree | None = None
+        self._reset_lookups()
 
     def _load_stellar_parameters_table(self) -> QTable:
         """
-        Load and prepare Mamajek table.
+        Return the processed Mamajek table, see :func:`_load_table`.
 
-        Can't directly load as QTable because of logarithmic units.
+        The table object is the instance's own, but its columns share the
+        process-wide, read-only data.
 
         Returns
         -------
@@ -205,33 +398,69 @@ class StellarParameters:
             Reduced Mamajek table.
 
         """
-        mamajek_full = Table.read(fetch_data_file(self._filename))
-
-        mamajek_redux = QTable(mamajek_full[[
-            "spectral_type",
-            "teff",
-            "mass",
-            "radius",
-
-            "M_V",
-            "M_J",
-            "M_Ks",
-
-            "U-B",
-            "B-V",
-            "V-Ks",
-            "J-H",
-            "H-Ks",
-        ]])
-
-        # Convert primary key column to SpectralType objects
-        mamajek_redux["spectral_type"] = [
-            SpectralType(spectype)
-            for spectype in mamajek_redux["spectral_type"]
-        ]
-        mamajek_redux.add_index("spectral_type", unique=True)
+        return _load_table(self._filename).copy(copy_data=False)
+
+    def _reset_lookups(self) -> None:
+        """Drop the lookup structures built from the current `table`."""
+        self._closest_indices: dict[str, Any] = {}
+        self._lookup_tree: KDTree | None = None
+        self._interpolators: dict[tuple[str, str], Any] = {}
+
+    @classmethod
+    def shared(
+        cls,
+        required_columns: str | Iterable[str] | None = None,
+    ) -> "StellarParameters":
+        """
+        Return the process-wide instance for `required_columns`.
+
+        Created on the first call, so its lookup structures (closest-value
+        indices, KD-tree, interpolators) are built once and then reused by all
+        callers. Don't modify its `table`, use :meth:`subset` instead.
+
+        Parameters
+        ----------
+        required_columns : str | Iterable[str] | None
+            See class docstring.
+
+        Returns
+        -------
+        stellar_params : StellarParameters
+            Shared instance.
+
+        """
+        if required_columns is not None:
+            required_columns = tuple(always_iterable(required_columns))
+        return _shared_instance(cls, required_columns)
 
-        return mamajek_redux
+    @staticmethod
+    def clear_table_cache() -> None:
+        """Drop the loaded table and all shared instances."""
+        _shared_instance.cache_clear()
+        _load_table.cache_clear()
+
+    def subset(self, rows) -> "StellarParameters":
+        """
+        Return a new instance restricted to `rows` of this one's table.
+
+        The new instance shares the parsed data and column units, but builds
+        its own lookup structures on demand.
+
+        Parameters
+        ----------
+        rows : array_like | slice
+            Row indices, boolean mask or slice into `table`.
+
+        Returns
+        -------
+        stellar_params : StellarParameters
+            Instance with the selected rows.
+
+        """
+        new = copy(self)
+        new.table = self.table[rows]
+        new._reset_lookups()
+        return new
 
     def group_spectral_classes(self) -> Iterator[SpectralClass]:
         """
@@ -276,6 +505,11 @@ class StellarParameters:
 
     def _setup_closest(self, colname: str) -> tuple[np.ndarray, np.ndarray]:
         sorted_indices, sorted_column = self._sort_col_idx(colname)
+        if hasattr(sorted_column, "mask"):  # e.g. mass
+            # Masked values are sorted last, leave them out entirely: a halfway
+            # point to one of them would break the ordering searched below.
+            sorted_indices = sorted_indices[~sorted_column.mask]
+            sorted_column = sorted_column[~sorted_column.mask].unmasked
         return sorted_indices, self._calc_halfways_points(sorted_column)
 
     def _get_closest_indices(self, colname: str):
@@ -295,12 +529,7 @@ class StellarParameters:
         _, halfway_points = self._get_closest_indices(colname)
         # Implementation adapted from (deprecated) scipy.interpolate.interp1d
         closest_indices = halfway_points.searchsorted(search_value, side="left")
-        # Clip to avoid matching masked values
-        if hasattr(halfway_points, "mask"):  # e.g. mass
-            max_good_index = len(halfway_points) - halfway_points.mask.sum()
-        else:  # e.g. teff
-            max_good_index = len(halfway_points)
-        return closest_indices.clip(0, max_good_index).astype(np.intp)
+        return closest_indices.clip(0, len(halfway_points)).astype(np.intp)
 
     @u.quantity_input
     def closest_mass(self, mass: u.Quantity[u.solMass]) -> QTable | Row:
@@ -320,11 +549,28 @@ class StellarParameters:
             will be a QTable, subset of the original table. If `mass` is scalar,
             the result will be a single Row object.
 
+        """
+        return self.table[self.closest_mass_indices(mass)]
+
+    @u.quantity_input
+    def closest_mass_indices(self, mass: u.Quantity[u.solMass]) -> np.ndarray:
+        """
+        Lookup the row index(es) closest to a given stellar mass(es).
+
+        Parameters
+        ----------
+        mass : u.Quantity[u.solMass]
+            Stellar mass(es) to look up, see :meth:`closest_mass`.
+
+        Returns
+        -------
+        indices : np.ndarray
+            Integer row index(es) into `table`, same shape as `mass`.
+
         """
         sorted_indices, _ = self._get_closest_indices("mass")
         closest_sorted_indices = self._search_halfways_points(mass, "mass")
-        actual_indices = sorted_indices[closest_sorted_indices]
-        return self.table[actual_indices]
+        return sorted_indices[closest_sorted_indices]
 
     @u.quantity_input
     def closest_teff(self, teff: u.Quantity[u.K]) -> QTable | Row:
@@ -351,93 +597,179 @@ class StellarParameters:
         return self.table[actual_indices]
 
     def _make_lookup_tree(self) -> KDTree:
-        # HACK: Using the existing index should ensure things are already
-        #       sorted, but this is untested because we initially sort this
-        #       column anyway. Whatever the case, there must be a better way to
-        #       get the values out than this double indexing...
-        spectral_type_array = [
-            spectype.to_array() for spectype in
-            self.table.indices["spectral_type"].data.data["spectral_type"]
-        ]
-        return KDTree(spectral_type_array)
+        # Built in table row order, so the tree's point indices are directly
+        # the table's row indices (no reverse lookup via the table index).
+        return KDTree(spectral_type_codes(self.table["spectral_type"]))
+
+    def closest_spectral_type_indices(
+        self,
+        spectral_type: SpectralType | str | Iterable[SpectralType | str],
+    ) -> np.ndarray:
+        """
+        Lookup the row index(es) closest to given spectral type(s).
 
-    def closest_spectral_type(self, spectral_type: SpectralType) -> QTable | Row:
-        # TODO: docstring
+        Parameters
+        ----------
+        spectral_type : SpectralType | str | Iterable[SpectralType | str]
+            Spectral type(s) to look up, see :func:`spectral_type_codes`.
+            Alternatively, a float array of such codes with shape ``(N, 2)``.
+
+        Returns
+        -------
+        indices : np.ndarray
+            Integer row indices into `table`, one per input spectral type.
+
+        """
         if self._lookup_tree is None:
             self._lookup_tree = self._make_lookup_tree()
 
-        # Deal with both scalar and array inputs
-        spectral_type_array = [
-            SpectralType(spectype).to_array() for spectype in
-            always_iterable(spectral_type)
-        ]
-        closest_spectypes = [
-            SpectralType.from_array(spectype) for spectype in
-            np.atleast_2d(self._lookup_tree.data[
-                self._lookup_tree.query(spectral_type_array)[1]
-            ])
-        ]
-        return self.table.loc[closest_spectypes]
+        codes = spectral_type
+        if not (isinstance(codes, np.ndarray) and codes.dtype.kind == "f"):
+            codes = spectral_type_codes(spectral_type)
+        return np.atleast_1d(self._lookup_tree.query(codes)[1])
+
+    def closest_spectral_type(
+        self,
+        spectral_type: SpectralType | str | Iterable[SpectralType | str],
+        columns: str | Iterable[str] | None = None,
+    ) -> QTable:
+        """
+        Lookup the row(s) closest to given spectral type(s).
+
+        Parameters
+        ----------
+        spectral_type : SpectralType | str | Iterable[SpectralType | str]
+            Spectral type(s) to look up, see
+            :meth:`closest_spectral_type_indices`.
+        columns : str | Iterable[str] | None
+            Column(s) to include in the result. If None (default), include all.
+
+        Returns
+        -------
+        closest_rows : QTable
+            Resulting rows, subset of the original table, one per input
+            spectral type (also for a scalar input).
+
+        """
+        indices = self.closest_spectral_type_indices(spectral_type)
+        table = self.table
+        if columns is not None:
+            table = table[list(always_iterable(columns))]
+        return table[indices]
 
     def _get_remaining_colnames(self, colname: str) -> list[str]:
         """Return all column names other than `colname` and "spectral_type"."""
         exclude = {"spectral_type", colname}
         return [col for col in self.table.colnames if col not in exclude]
 
-    def interpolate(self, colname: str, values: u.Quantity, extrapolate_phot: bool = False) -> QTable:
-        # TODO: store interpolator
-        # TODO: optionally supply output colnames (set intersection stuff)
-        if self.table[colname].unit != values.unit:
-            raise ValueError("units in values must match column")
+    def _get_interpolator(
+        self,
+        colname: str,
+        output: str,
+    ) -> tuple[PchipInterpolator | CubicSpline, float, float]:
+        """Return cached interpolator of `output` over `colname`.
 
-        columns = self._get_remaining_colnames(colname)
-        sorted_indices, sorted_column = self._sort_col_idx(colname)
+        Built on the first request for a column pair and stored on the
+        instance, together with the range of `colname` values it was built
+        from (outside of which the result is extrapolated).
+        """
+        interpolator = self._interpolators.get((colname, output))
+        if interpolator is not None:
+            return interpolator
 
+        sorted_indices, sorted_column = self._sort_col_idx(colname)
         if hasattr(sorted_column, "mask"):
             sorted_indices = sorted_indices[~sorted_column.mask]
             sorted_column = sorted_column[~sorted_column.mask]
+        xvalues = u.Quantity(getattr(sorted_column, "unmasked", sorted_column))
 
-        # TODO: find a more efficient way to do this
-        mask = structured_to_unstructured(
-            self.table.mask[columns][sorted_indices].as_array()
-        )
-        expanded = Masked(np.repeat(sorted_column[:, None], 10, 1), mask=mask)
-        mins = expanded.min(axis=0)
-        maxs = expanded.max(axis=0)
-        output_mask = (
-            (np.repeat(values[:, None], 10, 1) < mins) |
-            (np.repeat(values[:, None], 10, 1) > maxs)
-        )
+        col = self.table[output][sorted_indices]
+        valid = ~col.mask if hasattr(col, "mask") else slice(None)
+        xvalues = xvalues[valid].value
+        yvalues = u.Quantity(getattr(col, "unmasked", col))[valid].value
 
-        splines = []
-        for colname in columns:
-            col = self.table[colname][sorted_indices]
-            colmask = col.mask if hasattr(col, "mask") else np.zeros_like(col.value).astype(bool)
-            if colname in ("mass", "teff", "radius"):
-                spline = PchipInterpolator(sorted_column[~colmask], col[~colmask], extrapolate=False)
-            else:
-                spline = CubicSpline(sorted_column[~colmask], col[~colmask], extrapolate=True)
-                # see https://docs.scipy.org/doc/scipy/tutorial/interpolate/extrapolation_examples.html#cubicspline-extend-the-boundary-conditions
-                # TODO: Find a better way to extrapolate that works with the (otherwise much better) PchipInterpolator, get rid of that function.
-                _add_boundary_knots(spline)
-            splines.append(spline)
+        if output in ("mass", "teff", "radius"):
+            spline = PchipInterpolator(xvalues, yvalues, extrapolate=False)
+        else:
+            spline = CubicSpline(xvalues, yvalues, extrapolate=True)
+            # see https://docs.scipy.org/doc/scipy/tutorial/interpolate/extrapolation_examples.html#cubicspline-extend-the-boundary-conditions
+            # TODO: Find a better way to extrapolate that works with the (otherwise much better) PchipInterpolator, get rid of that function.
+            _add_boundary_knots(spline)
+
+        interpolator = (spline, xvalues.min(), xvalues.max())
+        return self._interpolators.setdefault((colname, output), interpolator)
+
+    def interpolate(
+        self,
+        colname: str,
+        values: u.Quantity,
+        extrapolate_phot: bool = False,
+        columns: str | Iterable[str] | None = None,
+    ) -> QTable:
+        """
+        Interpolate the table's columns at given values of one column.
+
+        Mass, Teff and radius are interpolated monotonically (PCHIP) and never
+        extrapolated, the photometric columns use cubic splines. Outside of the
+        range covered by the table for any output column, the result is
+        masked, unless `extrapolate_phot` is True (photometric columns only).
+
+        The interpolators are built once per pair of input and output column
+        and cached on the instance, so repeated calls only evaluate them.
 
-        # output_data = spline(mass).round(3)  # HACK: use table format instead?
+        Parameters
+        ----------
+        colname : str
+            Name of the input column, e.g. "mass".
+        values : u.Quantity
+            1D array of `colname` values to interpolate at. Unit must match
+            that of the column.
+        extrapolate_phot : bool, optional
+            Whether to extrapolate photometric columns. The default is False.
+        columns : str | Iterable[str] | None, optional
+            Output column(s). If None (default), all columns other than
+            `colname` and "spectral_type".
+
+        Raises
+        ------
+        ValueError
+            Raised if the unit of `values` doesn't match the column, or if any
+            of `columns` cannot be interpolated.
+
+        Returns
+        -------
+        result : QTable
+            Interpolated values, one row per value and one column per output
+            column.
+
+        """
+        if self.table[colname].unit != values.unit:
+            raise ValueError("units in values must match column")
+
+        remaining = self._get_remaining_colnames(colname)
+        if columns is None:
+            columns = remaining
+        else:
+            columns = list(always_iterable(columns))
+            if invalid := set(columns).difference(remaining):
+                raise ValueError(
+                    f"cannot interpolate column(s) {sorted(invalid)} over "
+                    f"{colname!r}"
+                )
+
+        xvalues = values.value
         # Output has to be Quantity BEFORE masking, otherwise QTable doesn't
         # return quantities upon [colname]...
-        # TODO: See if this can be done more efficiently and/or robust, as the
-        #       current implementation relies on correct column order...
-        masked_output = [
-            Masked(
-                splines[i](values).round(3)*self._col_units.get(col),
-                mask=(
-                    output_mask[:, i]
-                    if col in ("mass", "teff", "radius")
-                    or not extrapolate_phot
-                    else None
-                ),
-            ) for i, col in enumerate(columns)
-        ]
+        masked_output = []
+        for col in columns:
+            spline, xmin, xmax = self._get_interpolator(colname, col)
+            if col in ("mass", "teff", "radius") or not extrapolate_phot:
+                mask = (xvalues < xmin) | (xvalues > xmax)
+            else:
+                mask = None
+            output = spline(xvalues).round(3) * self._col_units.get(col)
+            masked_output.append(Masked(output, mask=mask))
+
         result = QTable(
             names=columns,
             data=masked_output,
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 """Various initial mass function (IMF) laws as scipy distributions."""
 
+from functools import lru_cache
+from collections.abc import Callable
+
 import numpy as np
 from scipy.stats import rv_continuous
+from scipy.stats.distributions import rv_frozen
 
 
 class BrokenPowerlaw(rv_continuous):
@@ -31,6 +35,57 @@ class BrokenPowerlaw(rv_continuous):
 
         return np.select(mass_ranges, powerlaws, default=0.0) * 4.2
 
+    def _inverse_cdf(self, a0, a1, a2, a3, m0, m1, m2, m3) -> Callable:
+        """Closed-form inverse CDF of the (normalized) PDF over the support.
+
+        Each segment is a power law ``c * x**-alpha``; its share of the total
+        integral picks the segment, within which the power law is inverted
+        analytically.
+        """
+        alpha = np.array([a0, a1, a2, a3], dtype=float)
+        # Continuity factors, as in _pdf
+        coeff = np.array([
+            m1**a0,
+            m1**a1,
+            (m2 / m1)**-a1 * m2**a2,
+            (m2 / m1)**-a1 * (m3 / m2)**-a2 * m3**a3,
+        ])
+        lower = max(self.a, m0)
+        edges = np.clip([m0, m1, m2, m3, self.b], lower, self.b)
+        keep = edges[1:] > edges[:-1]  # skip segments outside the support
+        low, high = edges[:-1][keep], edges[1:][keep]
+        coeff, expo = coeff[keep], 1 - alpha[keep]
+        is_log = expo == 0  # alpha == 1
+        safe_expo = np.where(is_log, 1.0, expo)
+
+        # Within each segment, the inverse CDF is affine in the cumulative
+        # integral, followed by a power (or exp for alpha == 1).
+        with np.errstate(divide="ignore"):
+            span = np.where(
+                is_log, np.log(high / low), high**safe_expo - low**safe_expo
+            )
+        weights = coeff * span / safe_expo
+        starts = np.concatenate([[0.0], weights.cumsum()])
+        slope = span / weights
+        offset = np.where(is_log, np.log(low), low**safe_expo)
+        offset -= slope * starts[:-1]
+        exponent = 1 / safe_expo
+
+        def inverse_cdf(q: np.ndarray) -> np.ndarray:
+            target = np.asarray(q, dtype=float) * starts[-1]
+            # Comparisons against the few segment starts beat searchsorted
+            seg = np.zeros(target.shape, dtype=np.int8)
+            for start in starts[1:-1]:
+                seg += target >= start
+            base = slope.take(seg)
+            base *= target
+            base += offset.take(seg)
+            if not is_log.any():
+                return np.power(base, exponent.take(seg), out=base)
+            return np.where(is_log[seg], np.exp(base), base**exponent[seg])
+
+        return inverse_cdf
+
 
 class LogNormal(rv_continuous):
     def _pdf(self, x, mo, delta, beta):
@@ -100,7 +155,80 @@ def load_default_imfs() -> dict[str, rv_continuous]:
     return imfs
 
 
-DEFAULT_IMFS = load_default_imfs()
+@lru_cache(maxsize=1)
+def _default_imfs() -> dict[str, rv_continuous]:
+    return load_default_imfs()
+
+
+def _imf_key(imf: rv_frozen | rv_continuous) -> tuple:
+    """Hashable identity of an IMF: distribution, shapes, loc, scale.
+
+    An unfrozen distribution is taken with its default parameters, as when
+    calling its methods without any.
+    """
+    if isinstance(imf, rv_continuous):
+        dist, args, kwds = imf, (), {}
+    elif isinstance(imf, rv_frozen) and isinstance(imf.dist, rv_continuous):
+        dist, args, kwds = imf.dist, imf.args, imf.kwds
+    else:
+        raise TypeError(
+            "IMF must be a continuous scipy.stats distribution, not "
+            f"{type(imf).__name__}"
+        )
+    shapes, loc, scale = dist._parse_args(*args, **kwds)
+    return (dist, tuple(float(shape) for shape in shapes),
+            float(loc), float(scale))
+
+
+@lru_cache(maxsize=16)
+def _inverse_cdf(key: tuple) -> Callable:
+    """Inverse CDF of a frozen IMF, set up once per distribution and params.
+
+    Closed form for :class:`BrokenPowerlaw`, otherwise a numerical inversion
+    (UNU.RAN's PINV method), which only needs the PDF.
+    """
+    dist, shapes, loc, scale = key
+    if isinstance(dist, BrokenPowerlaw):
+        inverse_cdf = dist._inverse_cdf(*shapes)
+        return lambda q: loc + scale * inverse_cdf(q)
+
+    from scipy.stats.sampling import NumericalInversePolynomial
+    generator = NumericalInversePolynomial(
+        dist(*shapes, loc=loc, scale=scale), center=0.1
+    )
+    return generator.ppf
+
+
+def sample_masses(
+    imf: rv_frozen | rv_continuous,
+    n_masses: int,
+    rng: np.random.Generator | int | None = None,
+) -> np.ndarray:
+    """Draw `n_masses` stellar masses [Msun] from `imf`.
+
+    Uniform deviates from `rng` are mapped through the IMF's inverse CDF,
+    which is set up only once per distribution and parameters.
+    """
+    rng = np.random.default_rng(rng)
+    return _inverse_cdf(_imf_key(imf))(rng.random(n_masses))
+
+
+@lru_cache(maxsize=16)
+def _mean_mass(key: tuple) -> float:
+    dist, shapes, loc, scale = key
+    return dist(*shapes, loc=loc, scale=scale).expect()
+
+
+def mean_mass(imf: rv_frozen | rv_continuous) -> float:
+    """Mean stellar mass [Msun] of `imf`, integrated once per parameters."""
+    return _mean_mass(_imf_key(imf))
+
+
+def __getattr__(name: str):
+    # DEFAULT_IMFS is built on first access rather than at import time.
+    if name == "DEFAULT_IMFS":
+        return _default_imfs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Chabrier03:
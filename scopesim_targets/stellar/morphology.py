@@ -1,37 +1,104 @@
 # -*- coding: utf-8 -*-
 """Star cluster morphologies."""
 
+from concurrent.futures import Executor
+from functools import lru_cache, partial
+
 import numpy as np
 from scipy.stats.sampling import NumericalInversePolynomial
 from astropy import units as u
-from astropy.coordinates import SkyCoord, Angle
+from astropy.coordinates import SkyCoord
 from astropy.modeling.functional_models import KingProjectedAnalytic1D
 from matplotlib import axes
 
 from ..target import length_angle_context
 from ..plot_utils import figure_factory, draw_circle
+from ..typing_utils import SEED_TYPE
+from .sampling import as_seed_sequence, sample_chunked
+
+# Below this separation [rad] (about 20 arcsec) the flat tangent-plane offsets
+# deviate from the exact spherical ones by < 1e-7 arcsec, well within the
+# 1e-6 arcsec rounding of the source table.
+SMALL_ANGLE_LIMIT = 1e-4
+
+
+def local_offsets(
+    position_angle: np.ndarray,
+    separation: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Offsets [arcsec] in the sky offset frame of the parent position.
+
+    Equivalent to ``parent.directional_offset_by(position_angle, separation)
+    .transform_to(parent.skyoffset_frame())``, but computed directly from
+    `position_angle` (east of north) and angular `separation` (both in rad).
+    Uses the tangent plane unless any separation exceeds `SMALL_ANGLE_LIMIT`,
+    otherwise spherical trigonometry.
+    """
+    sin_pa, cos_pa = np.sin(position_angle), np.cos(position_angle)
+    if not len(separation) or separation.max() < SMALL_ANGLE_LIMIT:
+        lon, lat = separation * sin_pa, separation * cos_pa
+    else:
+        sin_sep = np.sin(separation)
+        lon = np.arctan2(sin_sep * sin_pa, np.cos(separation))
+        lat = np.arcsin(np.clip(sin_sep * cos_pa, -1, 1))
+    to_arcsec = (1 * u.rad).to_value(u.arcsec)
+    return (lon * to_arcsec).round(6), (lat * to_arcsec).round(6)
 
 
 class Morphology:
     """Base class for stellar cluster morphologies."""
 
-    def __init__(self, n_stars: int):
+    def __init__(self, n_stars: int, seed: SEED_TYPE = None):
         self._n_stars = n_stars
-        self._rng = np.random.default_rng()
+        self._seed = as_seed_sequence(seed)
 
 
 class SphericallySymmetricalMorphology(Morphology):
-    def _sample_phi(self) -> Angle:
-        return Angle(self._rng.uniform(-np.pi, np.pi, self._n_stars) * u.rad)
+    """Morphology with uniformly distributed position angles."""
 
 
-class KingProfileMorphology(SphericallySymmetricalMorphology):
-    def __init__(self, n_stars: int, r_core: float, r_tide: float):
-        super().__init__(n_stars=n_stars)
+class KingRadialProfile(KingProjectedAnalytic1D):
+    def pdf(self, x):
+        return self(x << self.input_units["x"])
+
+
+@lru_cache(maxsize=16)
+def _king_sampler(
+    r_core: float,
+    r_tide: float,
+    unit: str,
+) -> NumericalInversePolynomial:
+    # Set up once per process and profile, also in pool workers.
+    radial_profile = KingRadialProfile(
+        amplitude=1,  # PDF sampler doesn't need scaling
+        r_core=r_core * u.Unit(unit),
+        r_tide=r_tide * u.Unit(unit),
+    )
+    return NumericalInversePolynomial(radial_profile)
+
+
+def _draw_king(
+    r_core: float,
+    r_tide: float,
+    unit: str,
+    size: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Module-level (rather than a method) so process pools can pickle it.
+    phi = rng.uniform(-np.pi, np.pi, size)
+    radius = _king_sampler(r_core, r_tide, unit).ppf(rng.random(size))
+    return phi, radius
 
-        class KingRadialProfile(KingProjectedAnalytic1D):
-            def pdf(self, x):
-                return self(x << self.input_units["x"])
+
+class KingProfileMorphology(SphericallySymmetricalMorphology):
+    def __init__(
+        self,
+        n_stars: int,
+        r_core: float,
+        r_tide: float,
+        seed: SEED_TYPE = None,
+    ):
+        super().__init__(n_stars=n_stars, seed=seed)
 
         self.radial_profile = KingRadialProfile(
             amplitude=1,  # PDF sampler doesn't need scaling
@@ -44,32 +111,48 @@ class KingProfileMorphology(SphericallySymmetricalMorphology):
                 f"{self.radial_profile.concentration}"
             )
 
-        self._sampler = NumericalInversePolynomial(
-            self.radial_profile,
-            random_state=self._rng,
+        self._draw = partial(
+            _draw_king,
+            self.radial_profile.r_core.value,
+            self.radial_profile.r_tide.value,
+            self.r_unit.to_string(),
         )
+        self._draw(0, np.random.default_rng(0))  # set up sampler eagerly
 
     @property
     def r_unit(self) -> u.Unit:
         return self.radial_profile.input_units["x"]
 
-    def _sample_radius(self):
-        return self._sampler.rvs(self._n_stars) << self.r_unit
+    def _sample_phi_radius(
+        self,
+        executor: Executor | None = None,
+    ) -> tuple[np.ndarray, u.Quantity]:
+        phi, radius = sample_chunked(
+            self._draw, self._n_stars, self._seed, executor
+        )
+        return phi, radius << self.r_unit
+
+    def sample(
+        self,
+        parent_position: SkyCoord,
+        executor: Executor | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Sample star positions as x/y offsets [arcsec] from the center.
 
-    def sample(self, parent_position: SkyCoord) -> SkyCoord:
-        # HACK: This is WET with PointSourceTarget.....
-        local_frame = parent_position.skyoffset_frame()
+        If given, `executor` draws the (seeded) chunks of stars in parallel,
+        with results identical to drawing them serially.
+        """
+        phi, radius = self._sample_phi_radius(executor)
         with length_angle_context(parent_position.distance):
-            local_positions = parent_position.directional_offset_by(
-                self._sample_phi(),
-                self._sample_radius(),
-            ).transform_to(local_frame)
-            x_arcsec = local_positions.lon.to_value(u.arcsec).round(6)
-            y_arcsec = local_positions.lat.to_value(u.arcsec).round(6)
-        return x_arcsec, y_arcsec
-
-    def to_source_columns(self, parent_position):
-        x_arcsec, y_arcsec = self.sample(parent_position)
+            separation = radius.to_value(u.rad)
+        return local_offsets(phi, separation)
+
+    def to_source_columns(
+        self,
+        parent_position,
+        executor: Executor | None = None,
+    ):
+        x_arcsec, y_arcsec = self.sample(parent_position, executor)
         return {"x": x_arcsec, "y": y_arcsec}
 
     def plot(
@@ -123,3 +206,285 @@ class KingProfileMorphology(SphericallySymmetricalMorphology):
         ax.legend()
 
         return ax
+
+
+def _draw_eff(
+    r_scale: float,
+    gamma: float,
+    f_max: float,
+    size: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Projected enclosed fraction F(R) = 1 - (1 + R^2/a^2)^(1 - gamma/2),
+    # inverted; f_max = F(r_max) truncates.
+    phi = rng.uniform(-np.pi, np.pi, size)
+    quantile = rng.random(size) * f_max
+    radius = r_scale * np.sqrt((1 - quantile) ** (1 / (1 - gamma / 2)) - 1)
+    return radius * np.cos(phi), radius * np.sin(phi)
+
+
+def _draw_plummer_3d(
+    r_scale: float,
+    f_max: float,
+    size: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Enclosed mass fraction M(r) = r^3 / (r^2 + a^2)^(3/2), inverted, in
+    # isotropic directions, projected along the line of sight.
+    phi = rng.uniform(-np.pi, np.pi, size)
+    cos_theta = rng.uniform(-1, 1, size)
+    quantile = (rng.random(size) * f_max) ** (2 / 3)
+    radius = r_scale * np.sqrt(quantile / (1 - quantile))
+    radius *= np.sqrt(1 - cos_theta**2)
+    return radius * np.cos(phi), radius * np.sin(phi)
+
+
+def _draw_gaussian(
+    sigma: float,
+    size: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    return rng.normal(0, sigma, size), rng.normal(0, sigma, size)
+
+
+# Offsets of the eight sub-cubes of a cube, in units of their half size.
+_OCTANTS = np.array(
+    [[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)],
+    dtype=float,
+)
+
+
+def _fractal_leaves(
+    dimension: float,
+    n_leaves: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, float]:
+    """Box fractal in the unit sphere, after Goodwin & Whitworth (2004).
+
+    Starting from a cube of side 2, every generation splits each surviving
+    cube into eight sub-cubes (with slightly jittered centers), of which each
+    survives with probability ``2**(dimension - 3)``. Stops as soon as at
+    least `n_leaves` cubes survive. Returns the projected (x, y) centers of
+    the leaf cubes inside the unit sphere and their half size.
+    """
+    centers = np.zeros((1, 3))
+    half_size = 1.
+    survival = 2**(dimension - 3)
+    while len(centers) < n_leaves:
+        parent, octant = np.nonzero(
+            rng.random((len(centers), len(_OCTANTS))) < survival
+        )
+        if not len(parent):
+            continue  # retry, an empty fractal is no use
+        half_size /= 2
+        centers = centers[parent] + half_size * _OCTANTS[octant]
+        centers += rng.normal(0, 0.1 * half_size, centers.shape)
+    inside = (centers**2).sum(axis=1) <= 1
+    if inside.any():
+        centers = centers[inside]
+    return centers[:, :2], half_size
+
+
+def _draw_fractal(
+    radius: float,
+    leaves: np.ndarray,
+    half_size: float,
+    size: int,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Stars are spread uniformly over randomly chosen leaf cubes.
+    xy = leaves[rng.integers(len(leaves), size=size)]
+    xy += rng.uniform(-half_size, half_size, xy.shape)
+    return radius * xy[:, 0], radius * xy[:, 1]
+
+
+class EllipticalMorphology(Morphology):
+    """Base class for morphologies from a (possibly elliptical) 2D sampler.
+
+    Subclasses provide ``_draw(size, rng)``, which returns star offsets along
+    the major and minor axis in `r_unit` as for a round cluster. These are
+    compressed by `axis_ratio` (minor / major) along the minor axis, and
+    rotated so that the major axis lies at `position_angle` (east of north).
+    """
+
+    def __init__(
+        self,
+        n_stars: int,
+        r_unit: u.Unit,
+        axis_ratio: float = 1.,
+        position_angle: u.Quantity[u.deg] = 0 * u.deg,
+        seed: SEED_TYPE = None,
+    ):
+        super().__init__(n_stars=n_stars, seed=seed)
+        if not 0 < axis_ratio <= 1:
+            raise ValueError(
+                f"axis_ratio should be in (0, 1], but is {axis_ratio}"
+            )
+        self.r_unit = u.Unit(r_unit)
+        self.axis_ratio = axis_ratio
+        self.position_angle = u.Quantity(position_angle, u.deg)
+
+    def _draw_function(self):
+        return self._draw
+
+    def sample(
+        self,
+        parent_position: SkyCoord,
+        executor: Executor | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Sample star positions as x/y offsets [arcsec] from the center.
+
+        If given, `executor` draws the (seeded) chunks of stars in parallel,
+        with results identical to drawing them serially.
+        """
+        major, minor = sample_chunked(
+            self._draw_function(), self._n_stars, self._seed, executor
+        )
+        minor *= self.axis_ratio
+        pa_rad = self.position_angle.to_value(u.rad)
+        sin_pa, cos_pa = np.sin(pa_rad), np.cos(pa_rad)
+        east = major * sin_pa + minor * cos_pa
+        north = major * cos_pa - minor * sin_pa
+        with length_angle_context(parent_position.distance):
+            to_rad = (1 * self.r_unit).to_value(u.rad)
+        return local_offsets(
+            np.arctan2(east, north), np.hypot(east, north) * to_rad
+        )
+
+    def to_source_columns(
+        self,
+        parent_position,
+        executor: Executor | None = None,
+    ):
+        x_arcsec, y_arcsec = self.sample(parent_position, executor)
+        return {"x": x_arcsec, "y": y_arcsec}
+
+
+class EFFMorphology(EllipticalMorphology):
+    """Elson, Fall & Freeman (1987) profile.
+
+    Surface density ``(1 + R**2 / r_scale**2)**(-gamma / 2)``, optionally
+    truncated at (projected) radius `r_max`. Radii are drawn through the
+    closed-form inverse of the enclosed fraction, which requires
+    ``gamma > 2``.
+    """
+
+    def __init__(
+        self,
+        n_stars: int,
+        r_scale: u.Quantity[u.pc],
+        gamma: float,
+        r_max: u.Quantity[u.pc] | None = None,
+        axis_ratio: float = 1.,
+        position_angle: u.Quantity[u.deg] = 0 * u.deg,
+        seed: SEED_TYPE = None,
+    ):
+        r_scale = u.Quantity(r_scale)
+        super().__init__(n_stars, r_scale.unit, axis_ratio, position_angle,
+                         seed)
+        if gamma <= 2:
+            raise ValueError(f"gamma should be > 2, but is {gamma}")
+        self.r_scale = r_scale
+        self.gamma = gamma
+        self.r_max = None if r_max is None else u.Quantity(r_max, self.r_unit)
+        self._draw = partial(
+            _draw_eff, r_scale.value, gamma, self._enclosed_fraction()
+        )
+
+    def _enclosed_fraction(self) -> float:
+        if self.r_max is None:
+            return 1.
+        x_max = (self.r_max / self.r_scale).to_value(u.one)
+        return 1 - (1 + x_max**2) ** (1 - self.gamma / 2)
+
+
+class PlummerMorphology(EFFMorphology):
+    """Plummer (1911) profile, i.e. EFF with ``gamma = 4``.
+
+    With `three_d`, stars are drawn from the 3D profile (truncated at 3D
+    radius `r_max`, if given) and projected along the line of sight. Without
+    truncation, this gives the same distribution as the default 2D sampling.
+    """
+
+    def __init__(
+        self,
+        n_stars: int,
+        r_scale: u.Quantity[u.pc],
+        r_max: u.Quantity[u.pc] | None = None,
+        three_d: bool = False,
+        axis_ratio: float = 1.,
+        position_angle: u.Quantity[u.deg] = 0 * u.deg,
+        seed: SEED_TYPE = None,
+    ):
+        self.three_d = three_d  # needed for the enclosed fraction
+        super().__init__(n_stars, r_scale, 4, r_max, axis_ratio,
+                         position_angle, seed)
+        if three_d:
+            self._draw = partial(
+                _draw_plummer_3d, self.r_scale.value, self._enclosed_fraction()
+            )
+
+    def _enclosed_fraction(self) -> float:
+        if self.r_max is None or not self.three_d:
+            return super()._enclosed_fraction()
+        x_max = (self.r_max / self.r_scale).to_value(u.one)
+        return x_max**3 / (1 + x_max**2) ** 1.5
+
+
+class GaussianMorphology(EllipticalMorphology):
+    """(Elliptical) Gaussian with standard deviation `sigma` (major axis)."""
+
+    def __init__(
+        self,
+        n_stars: int,
+        sigma: u.Quantity[u.pc],
+        axis_ratio: float = 1.,
+        position_angle: u.Quantity[u.deg] = 0 * u.deg,
+        seed: SEED_TYPE = None,
+    ):
+        sigma = u.Quantity(sigma)
+        super().__init__(n_stars, sigma.unit, axis_ratio, position_angle, seed)
+        self.sigma = sigma
+        self._draw = partial(_draw_gaussian, sigma.value)
+
+
+class FractalMorphology(EllipticalMorphology):
+    """Substructured cluster from a 3D box fractal of given dimension.
+
+    A `fractal_dimension` of 3 gives a uniform sphere of `radius`, lower
+    values increasingly clumpy structure (about 1.6 to 2.6 are observed in
+    young star-forming regions). Each sample builds a new fractal (from the
+    seed), which stops growing at about `n_stars` leaves, so the cost stays
+    linear in `n_stars`.
+    """
+
+    def __init__(
+        self,
+        n_stars: int,
+        radius: u.Quantity[u.pc],
+        fractal_dimension: float = 2.,
+        axis_ratio: float = 1.,
+        position_angle: u.Quantity[u.deg] = 0 * u.deg,
+        seed: SEED_TYPE = None,
+    ):
+        radius = u.Quantity(radius)
+        super().__init__(n_stars, radius.unit, axis_ratio, position_angle,
+                         seed)
+        if not 1 <= fractal_dimension <= 3:
+            raise ValueError(
+                "fractal_dimension should be in [1, 3], but is "
+                f"{fractal_dimension}"
+            )
+        self.radius = radius
+        self.fractal_dimension = fractal_dimension
+
+    def _draw_function(self):
+        # The structure is shared by all chunks, so it's built up front from
+        # its own child stream.
+        structure_seed, = self._seed.spawn(1)
+        leaves, half_size = _fractal_leaves(
+            self.fractal_dimension,
+            self._n_stars,
+            np.random.default_rng(structure_seed),
+        )
+        return partial(_draw_fractal, self.radius.value, leaves, half_size)
@@ -1,32 +1,123 @@
 # -*- coding: utf-8 -*-
 """Stellar populations."""
 
+from concurrent.futures import Executor
+from functools import lru_cache, partial
+
 import numpy as np
 from scipy.stats import rv_continuous
-from scipy.stats.sampling import NumericalInversePolynomial
 from astropy import units as u
 from matplotlib import axes
 
 from astar_utils import SpectralType
-from spextra import SpecLibrary, Spextrum
 
+from ..target import SpectrumTarget
 from ..spectral_classes import StellarParameters
 from ..plot_utils import figure_factory
-from .imf import DEFAULT_IMFS
+from ..typing_utils import SEED_TYPE
+from . import imf as imf_module
+from .sampling import as_seed_sequence, sample_chunked
 
 # Split at 1.07 Msol, F/G border
-DEFAULT_LIBRARY_LOW_MASS = SpecLibrary("irtf")
-DEFAULT_LIBRARY_HIGH_MASS = SpecLibrary("kurucz")
+_LIBRARY_LOW_MASS = "irtf"
+_LIBRARY_HIGH_MASS = "kurucz"
 HIGH_LOW_MASS_LIMIT = 1.07*u.solMass
 
 
+@lru_cache(maxsize=None)
+def _spec_library(name: str):
+    from spextra import SpecLibrary
+    return SpecLibrary(name)
+
+
+def __getattr__(name: str):
+    # The default libraries are loaded on first access, see _spec_library.
+    match name:
+        case "DEFAULT_LIBRARY_LOW_MASS":
+            return _spec_library(_LIBRARY_LOW_MASS)
+        case "DEFAULT_LIBRARY_HIGH_MASS":
+            return _spec_library(_LIBRARY_HIGH_MASS)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def _library_parameters(
+    name: str,
+    start: str | None,
+    stop: str | None,
+) -> StellarParameters:
+    """Stellar parameters of the spectral types in spextra library `name`.
+
+    Crops the lookup table (rows with M_J) to the spectral types found in both
+    the table and the library, between `start` and `stop` (inclusive spectral
+    type bounds, None for open). Computed once per process, together with the
+    cropped table's own lookup structures.
+    """
+    # HACK: This is to crop the stellar parameters table to only include
+    #       spectral types found in a given spextra library. There are
+    #       multiple competing ideas on how to properly implement this, but
+    #       I'm not yet sure which is best so I didn't want to commit to
+    #       implementing any of those for now. This hack is easiest to
+    #       remove again once a proper solution exists...
+    # Filter to those found in both the library and the lookup table,
+    # sorted() turns it into the required list.
+    # I tried to do some fancy set intersection here, which did work, but
+    # not for the Brown Dwarfs, because those are listed as e.g. L5V in the
+    # Mamajek table, but as e.g. L5 in the IRTF library, and while e.g. L5
+    # is considered equal to L5V and works in table indexing, it does not
+    # work in the comparison in a set. But this here is also fine.
+    stp = StellarParameters.shared("M_J")  # need to override default
+    common_spectypes = set()
+    for spectype in _spec_library(name):
+        try:
+            spectype = SpectralType(spectype)
+            if spectype in stp.table["spectral_type"]:
+                common_spectypes.add(spectype)
+        except ValueError:
+            # Catch and ignore non-standard names in library
+            continue
+    stp = stp.subset(stp.table.loc_indices[sorted(common_spectypes)])
+    return stp.subset(stp.table.loc_indices[start:stop])
+
+
+@lru_cache(maxsize=None)
+def _library_template(name: str, spectype: SpectralType):
+    """Template of `spectype` from spextra library `name`, scaled to M_J.
+
+    Resolved on first use only, so a population pays for the spectral types
+    it actually contains.
+    """
+    specname = str(spectype)
+    if name == _LIBRARY_HIGH_MASS:
+        specname = specname.lower()
+    elif specname.startswith(("L", "T", "Y")):
+        # LTY have no "V" in that library -.-
+        specname = specname.removesuffix("V")
+    spec = SpectrumTarget.resolve_spectrum(f"spex:{name}/{specname}")
+    # TODO: forcing M_J now cuts us off at B0V on the high end, which isn't
+    #       brilliant, although fine for now
+    absmag = StellarParameters.shared("M_J").table.loc[spectype]["M_J"]
+    return spec.scale_to_magnitude(absmag.unmasked, "J")
+
+
+class _DefaultIMF:
+    """Class attribute resolving to a default IMF on first access."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner=None) -> rv_continuous:
+        return imf_module.DEFAULT_IMFS[self.name]
+
+
 class Population:
     """Base class for stellar populations."""
 
-    def __init__(self, n_stars: int):
+    def __init__(self, n_stars: int, seed: SEED_TYPE = None):
         self._n_stars = n_stars
-        # TODO: Consider using a singelton-ish thing here
-        self._stellar_params = StellarParameters()  # Default lookup table
+        self._seed = as_seed_sequence(seed)
+        # Default lookup table, shared so its interpolators are built once
+        self._stellar_params = StellarParameters.shared()
 
 
 class ZeroAgePopulation(Population):
@@ -36,34 +127,55 @@ class ZeroAgePopulation(Population):
 class IMFPopulation(ZeroAgePopulation):
     """Zero-age stellar population sampled from an IMF interpreted as a PDF."""
 
-    imf: rv_continuous = DEFAULT_IMFS["kroupa02"]
+    imf: rv_continuous = _DefaultIMF("kroupa02")
 
-    def __init__(self, n_stars: int, imf: rv_continuous | None = None):
-        super().__init__(n_stars)
+    def __init__(
+        self,
+        n_stars: int,
+        imf: rv_continuous | None = None,
+        seed: SEED_TYPE = None,
+    ):
+        super().__init__(n_stars, seed)
         if imf is not None:
             self.imf = imf
 
     @classmethod
     @u.quantity_input
-    def from_total_mass(cls, total_mass: u.Quantity[u.solMass], imf: rv_continuous | None = None):
+    def from_total_mass(
+        cls,
+        total_mass: u.Quantity[u.solMass],
+        imf: rv_continuous | None = None,
+        seed: SEED_TYPE = None,
+    ):
         """Generate population for total (cluster) mass.
 
         For non-continous distributions (e.g. broken powerlaw) this can deviate
         by about 3 %, otherwise within 1 % (all empirical).
         """
         imf = imf or cls.imf  # default if None
-        n_stars = int(total_mass.to_value(u.solMass) / imf.expect())
-        return cls(n_stars, imf)
+        mean_mass = imf_module.mean_mass(imf)
+        n_stars = int(total_mass.to_value(u.solMass) / mean_mass)
+        return cls(n_stars, imf, seed)
+
+    def sample_imf(
+        self,
+        executor: Executor | None = None,
+    ) -> u.Quantity[u.solMass]:
+        """Draw the stellar masses, in parallel chunks if `executor` is given.
 
-    def sample_imf(self) -> u.Quantity[u.solMass]:
-        urng = np.random.default_rng()
-        rng = NumericalInversePolynomial(self.imf, center=0.1, random_state=urng)
-        return rng.rvs(self._n_stars).round(3) * u.solMass
+        For a given seed, the masses don't depend on the `executor` used.
+        """
+        masses = sample_chunked(
+            partial(imf_module.sample_masses, self.imf),
+            self._n_stars, self._seed, executor,
+        )
+        return masses.round(3) * u.solMass
 
     def _masses_to_brightness(self, masses, absmag_col: str):
         absmags = (
             self._stellar_params
-            .interpolate("mass", masses, extrapolate_phot=True)[absmag_col]
+            .interpolate("mass", masses, extrapolate_phot=True,
+                         columns=absmag_col)[absmag_col]
             .round(2)
         )
         if hasattr(absmags, "mask") and not absmags.mask.any():
@@ -72,89 +184,55 @@ class IMFPopulation(ZeroAgePopulation):
         return absmags
 
     def _masses_to_spectra(self, masses):
-        # HACK: This is to crop the stellar parameters table to only include
-        #       spectral types found in a given spextra library. There are
-        #       multiple competing ideas on how to properly implement this, but
-        #       I'm not yet sure which is best so I didn't want to commit to
-        #       implementing any of those for now. This hack is easiest to
-        #       remove again once a proper solution exists...
-        # Note: This hack requires that stp is freshly created, otherwise there
-        #       might be interpolators and lookup tables already setup which are
-        #       not limited to the overwritten table...
-        # Filter to those found in both the library and the lookup table,
-        # sorted() turns it into the required list.
-        # I tried to do some fancy set intersection here, which did work, but
-        # not for the Brown Dwarfs, because those are listed as e.g. L5V in the
-        # Mamajek table, but as e.g. L5 in the IRTF library, and while e.g. L5
-        # is considered equal to L5V and works in table indexing, it does not
-        # work in the comparison in a set. But this here is also fine.
-        stp_low_mass = StellarParameters("M_J")  # need to override default
-        common_spectypes = set()
-        for spectype in DEFAULT_LIBRARY_LOW_MASS:
-            try:
-                spectype = SpectralType(spectype)
-                if spectype in stp_low_mass.table["spectral_type"]:
-                    common_spectypes.add(spectype)
-            except ValueError:
-                # Catch and ignore non-standard names in library
-                continue
-        stp_low_mass.table = stp_low_mass.table.loc[sorted(common_spectypes)]
-
-        stp_high_mass = StellarParameters("M_J")  # need to override default
-        common_spectypes = set()
-        for spectype in DEFAULT_LIBRARY_HIGH_MASS:
-            try:
-                spectype = SpectralType(spectype)
-                if spectype in stp_high_mass.table["spectral_type"]:
-                    common_spectypes.add(spectype)
-            except ValueError:
-                # Catch and ignore non-standard names in library
-                continue
-        stp_high_mass.table = stp_high_mass.table.loc[sorted(common_spectypes)]
-
-        stp_low_mass.table = stp_low_mass.table.loc["G0":]
-        stp_high_mass.table = stp_high_mass.table.loc[:"F9.9"]
-
-        spectypes = np.where(
-            masses < HIGH_LOW_MASS_LIMIT,
-            stp_low_mass.closest_mass(masses)["spectral_type"],
-            stp_high_mass.closest_mass(masses)["spectral_type"],
+        # Split at HIGH_LOW_MASS_LIMIT between the two libraries; templates
+        # are only resolved for the spectral types actually drawn.
+        stp_low_mass = _library_parameters(_LIBRARY_LOW_MASS, "G0", None)
+        stp_high_mass = _library_parameters(_LIBRARY_HIGH_MASS, None, "F9.9")
+
+        is_low_mass = masses < HIGH_LOW_MASS_LIMIT
+        rows = np.empty(len(masses), dtype=np.intp)
+        rows[is_low_mass] = stp_low_mass.closest_mass_indices(
+            masses[is_low_mass]
         )
-
-        # TODO: forcing M_J now cuts us off at B0V on the high end, which isn't
-        #       brilliant, although fine for now
+        # Offset to distinguish high-mass rows from low-mass ones
+        rows[~is_low_mass] = len(stp_low_mass.table) + (
+            stp_high_mass.closest_mass_indices(masses[~is_low_mass])
+        )
+        drawn_rows, specref = np.unique(rows, return_inverse=True)
+        if not len(drawn_rows):
+            # ScopeSim rejects table fields without spectra, so an empty
+            # selection still gets one (unreferenced) template.
+            drawn_rows = np.zeros(1, dtype=np.intp)
+
+        # HACK: While specref still only works with ints in ScopeSim, the index
+        #       into the drawn (unique) spectral types is used as the ID.
         spectra = {}
-        for row in stp_high_mass.table:
-            spectype = row["spectral_type"]
-            libname = DEFAULT_LIBRARY_HIGH_MASS.name
-            spec = Spextrum(f"{libname}/{str(spectype).lower()}")
-            absmag = row["M_J"]
-            if absmag.mask:
-                continue
-            spectra[spectype] = spec.scale_to_magnitude(absmag.unmasked, "J")
-        for row in stp_low_mass.table:
-            spectype = row["spectral_type"]
-            libname = DEFAULT_LIBRARY_LOW_MASS.name
-            specname = str(spectype)
-            # LTY have no "V" in that library -.-
-            if specname.startswith(("L", "T", "Y")):
-                specname = specname.removesuffix("V")
-            spec = Spextrum(f"{libname}/{specname}")
-            absmag = row["M_J"]
-            if absmag.mask:
-                continue
-            spectra[spectype] = spec.scale_to_magnitude(absmag.unmasked, "J")
-
-        # HACK: While specref still only works with ints in ScopeSim, this seems
-        #       to be the quickest way to turn spectypes into IDs...
-        specref_lookup = {spec: i for i, spec in enumerate(spectra)}
-        specref = np.array([specref_lookup[spec] for spec in spectypes])
-
-        spectra = dict(enumerate(spectra.values()))
+        for ref, row in enumerate(drawn_rows):
+            if row < len(stp_low_mass.table):
+                library, stp = _LIBRARY_LOW_MASS, stp_low_mass
+            else:
+                library, stp = _LIBRARY_HIGH_MASS, stp_high_mass
+                row -= len(stp_low_mass.table)
+            spectype = stp.table["spectral_type"][row]
+            spectra[ref] = _library_template(library, spectype)
         return specref, spectra
 
-    def to_source_columns(self, parent_position, absmag_col: str = "M_J"):
-        masses = self.sample_imf()
+    def to_source_columns(
+        self,
+        parent_position,
+        absmag_col: str = "M_J",
+        select: np.ndarray | None = None,
+        executor: Executor | None = None,
+    ):
+        """Sample the population and build the source table columns.
+
+        If given, `select` (boolean mask or indices) picks the sampled stars
+        to keep before any spectra or magnitudes are looked up. `executor` is
+        passed on to `sample_imf`.
+        """
+        masses = self.sample_imf(executor)
+        if select is not None:
+            masses = masses[select]
         specref, spectra = self._masses_to_spectra(masses)
         absmags = self._masses_to_brightness(masses, absmag_col)
 
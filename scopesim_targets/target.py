@@ -3,19 +3,24 @@
 
 from abc import ABCMeta, abstractmethod
 from functools import lru_cache
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+import numpy as np
 from astropy import units as u
 from astropy.coordinates import SkyCoord, Angle, Distance
 from synphot import SourceSpectrum
 from synphot.units import VEGAMAG
 
 from astar_utils import SpectralType
-from spextra import Spextrum, SpecLibrary, FilterSystem, Passband
-from scopesim import Source
 
 from .typing_utils import POSITION_TYPE, SPECTRUM_TYPE, BRIGHTNESS_TYPE
-from .flux_scaling import synphot_flux_scale
+from .flux_scaling import (
+    synphot_flux_scale,
+    batch_flux_scale,
+    zero_point_flux,
+)
 from .brightness import (
     parse_brightness,
     Brightness,
@@ -29,6 +34,12 @@ from .brightness import (
     MissingBandError,
 )
 
+if TYPE_CHECKING:
+    # SpeXtra and ScopeSim are heavy to import (and ScopeSim is optional), so
+    # both are only imported where they are first needed.
+    from spextra import Spextrum, FilterSystem, SpecLibrary, Passband
+    from scopesim import Source
+
 
 # Magnitude system -> the synphot function unit black_body_spectrum expects.
 _BB_MAG_UNIT = {
@@ -49,16 +60,97 @@ def _vega_reference() -> SourceSpectrum:
     return SourceSpectrum.from_vega()
 
 
-# For now, limit possible bands to ETC filters in SpeXtra
-FILTER_SYSTEM = FilterSystem("etc")
-DEFAULT_LIBRARY = SpecLibrary("bosz/lr")
+@lru_cache(maxsize=1)
+def _filter_system() -> "FilterSystem":
+    """The :data:`FILTER_SYSTEM`, created on first use."""
+    from spextra import FilterSystem
+    # For now, limit possible bands to ETC filters in SpeXtra
+    return FilterSystem("etc")
+
+
+@lru_cache(maxsize=1)
+def _default_library() -> "SpecLibrary":
+    """The :data:`DEFAULT_LIBRARY`, created on first use."""
+    from spextra import SpecLibrary
+    return SpecLibrary("bosz/lr")
+
+
+def __getattr__(name: str):
+    # FILTER_SYSTEM and DEFAULT_LIBRARY are created lazily (see above), so
+    # that importing this module doesn't load SpeXtra's databases.
+    match name:
+        case "FILTER_SYSTEM":
+            return _filter_system()
+        case "DEFAULT_LIBRARY":
+            return _default_library()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def get_passband(band: str) -> "Passband":
+    """The :data:`FILTER_SYSTEM` passband named `band`, loaded once.
+
+    Network-backed on first use; every later call for the same band (from any
+    target) returns the same instance.
+    """
+    from spextra import Passband
+    return Passband(f"{_filter_system().name}/{band}")
+
+
+@lru_cache(maxsize=None)
+def get_zero_point(
+    band: str,
+    system: PhotometricSystem = PhotometricSystem.VEGA,
+) -> u.Quantity:
+    """Zero-point flux density [FLAM] of `band` in the magnitude `system`.
+
+    Computed once per (band, system) via
+    :func:`~.flux_scaling.zero_point_flux` and reused for every target, so a
+    magnitude scale costs a table lookup plus one band average of the template.
+    Only the VEGA system pulls in the (network-backed) Vega reference.
+    """
+    system = PhotometricSystem(system)
+    vegaspec = (
+        _vega_reference() if system is PhotometricSystem.VEGA else None
+    )
+    return zero_point_flux(get_passband(band), system, vegaspec=vegaspec)
+
+
+# Upper bound on resolved spectra kept alive by the resolver cache.
+SPECTRUM_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=SPECTRUM_CACHE_SIZE)
+def _load_spectrum(key: tuple) -> SourceSpectrum:
+    """Build the spectrum for a normalized identifier key, LRU-cached.
+
+    The key is produced by :meth:`SpectrumTarget._spectrum_cache_key`, so any
+    two targets referring to the same template (e.g. a field of "G2V" stars)
+    share one loaded and parsed instance. Consumers never modify a resolved
+    spectrum in place (scaling and redshifting return new objects), which is
+    what makes sharing safe.
+    """
+    from spextra import Spextrum
+
+    match key:
+        case ("spex", name):
+            return Spextrum(name)
+        case ("file", path, _):
+            # TODO: Convert to SpeXtrum to get full method access?
+            return SourceSpectrum.from_file(path)
+        case ("blackbody", temp, temp_unit, amplitude, amplitude_unit, band):
+            return Spextrum.black_body_spectrum(
+                temp * temp_unit, amplitude * amplitude_unit, band
+            )
+        case _:
+            raise ValueError(f"Unknown spectrum cache key {key!r}.")
 
 
 class Target(metaclass=ABCMeta):
     """Main class in scopesim-targets."""
 
     @abstractmethod
-    def to_source(self, optical_train=None) -> Source:
+    def to_source(self, optical_train=None) -> "Source":
         """Convert to ScopeSim Source object."""
         raise NotImplementedError()
 
@@ -253,6 +345,12 @@ class SpectrumTarget(Target):
         .. todo:: Actually implement this "next-closest available template", see
             :issue:`68`.
 
+        Resolved spectra are memoized process-wide in a bounded LRU cache keyed
+        on the normalized identifier (see :meth:`_spectrum_cache_key`), so all
+        targets referring to the same template share one instance. Use
+        :meth:`spectrum_cache_info` and :meth:`clear_spectrum_cache` to inspect
+        or reset it. ``SourceSpectrum`` instances are passed through uncached.
+
         Returns
         -------
         Spextrum
@@ -262,28 +360,67 @@ class SpectrumTarget(Target):
             # TODO: Convert to SpeXtrum to get full method access?
             return spectrum
 
+        return _load_spectrum(
+            SpectrumTarget._spectrum_cache_key(spectrum, brightness)
+        )
+
+    @staticmethod
+    def _spectrum_cache_key(
+        spectrum: SPECTRUM_TYPE,
+        brightness: Brightness | None = None,
+    ) -> tuple:
+        """Normalize a (non-synphot) spectrum identifier into a hashable key.
+
+        ``file:`` keys include the file's modification time, so an edited file
+        is re-read instead of served stale. ``blackbody:`` keys include the
+        amplitude and reference band, because spextra bakes the flux scale
+        into construction (see :meth:`_blackbody_amplitude`). Quantities are
+        split into value and unit, which are hashable on their own.
+        """
         if isinstance(spectrum, str) and spectrum.startswith("spex:"):
             # Explicit SpeXtra identifier
-            return Spextrum(spectrum.removeprefix("spex:"))
+            return ("spex", spectrum.removeprefix("spex:"))
 
         if isinstance(spectrum, str) and spectrum.startswith("file:"):
-            # TODO: Convert to SpeXtrum to get full method access?
             # TODO: Use pathlib file URI here
-            return SourceSpectrum.from_file(spectrum.removeprefix("file:"))
+            path = Path(spectrum.removeprefix("file:")).resolve()
+            return ("file", str(path), path.stat().st_mtime_ns)
 
         if isinstance(spectrum, str) and spectrum.startswith("blackbody:"):
             temp = u.Quantity(spectrum.removeprefix("blackbody:"))
             amplitude, band = SpectrumTarget._blackbody_amplitude(brightness)
-            spec = Spextrum.black_body_spectrum(temp, amplitude, band)
-            return spec
+            return (
+                "blackbody",
+                float(temp.value),
+                temp.unit,
+                float(amplitude.value),
+                amplitude.unit,
+                band,
+            )
 
         # HACK: The current DEFAULT_LIBRARY stores spectral classes in lowercase
         #       letters, while SpectralType converts to uppercase. This needs a
         #       proper fix down the road.
-        return Spextrum(f"{DEFAULT_LIBRARY.name}/{str(spectrum).lower()}")
+        return ("spex", f"{_default_library().name}/{str(spectrum).lower()}")
+
+    @staticmethod
+    def spectrum_cache_info():
+        """Hit/miss statistics of the shared spectrum resolver cache.
+
+        Returns the ``functools`` ``CacheInfo`` named tuple (``hits``,
+        ``misses``, ``maxsize``, ``currsize``).
+        """
+        return _load_spectrum.cache_info()
 
     @staticmethod
-    def redshift_spectrum(spectrum: Spextrum, position: SkyCoord) -> Spextrum:
+    def clear_spectrum_cache() -> None:
+        """Drop all cached resolved spectra and reset the statistics."""
+        _load_spectrum.cache_clear()
+
+    @staticmethod
+    def redshift_spectrum(
+        spectrum: "Spextrum", position: SkyCoord
+    ) -> "Spextrum":
         """Doppler shift spectrum based on position `z` or `v_rad`."""
         # TODO: Add proper unit tests for this!
         if (
@@ -349,14 +486,18 @@ class SpectrumTarget(Target):
         wrapper adds the one load-time check the pure parser deliberately omits:
         band membership in the active :data:`FILTER_SYSTEM`. The
         ``{from_spectral_type: ...}`` resolver marker is passed through untouched
-        (its band is validated when the resolver fires).
+        (its band is validated when the resolver fires). An already normalized
+        :class:`Brightness` is re-validated, not re-parsed.
         """
-        parsed = parse_brightness(brightness)
+        if isinstance(brightness, Brightness):
+            parsed = brightness
+        else:
+            parsed = parse_brightness(brightness)
         if isinstance(parsed, FromSpectralType):
             return parsed
         if (
             parsed.locator_kind is LocatorKind.BAND
-            and parsed.locator not in FILTER_SYSTEM
+            and parsed.locator not in _filter_system()
         ):
             raise ValueError(f"Band '{parsed.locator}' unknown.")
         return parsed
@@ -388,7 +529,7 @@ class SpectrumTarget(Target):
             )
 
         table = self._lookup_table(resolver.table)
-        row = table.closest_spectral_type(spectrum)
+        row = table.closest_spectral_type(spectrum)[0]
         column = f"M_{resolver.band}"
         if column not in row.colnames:
             available = [c for c in row.colnames if c.startswith("M_")]
@@ -489,8 +630,8 @@ class SpectrumTarget(Target):
         """Factor to scale ``spectrum`` so its photometry matches ``brightness``.
 
         Resolves the two network-backed inputs -- the bandpass (spextra
-        ``Passband``) and, for Vega magnitudes, the Vega reference -- and
-        delegates the unit arithmetic to
+        ``Passband``) and, for magnitudes, the band's zero point (see
+        :meth:`_scale_references`) -- and delegates the unit arithmetic to
         :func:`~.flux_scaling.synphot_flux_scale`. Covers every branch of the
         grammar (magnitude in any system; flux density per frequency or
         wavelength; band-integrated energy flux) at band / wavelength /
@@ -504,21 +645,102 @@ class SpectrumTarget(Target):
                 "E7", "surface brightness is invalid for a point source"
             )
 
+        return synphot_flux_scale(
+            spectrum, brightness, **SpectrumTarget._scale_references(brightness)
+        )
+
+    @staticmethod
+    def _scale_references(brightness: Brightness) -> dict:
+        """Resolve the ``band`` and ``zero_point`` inputs of the flux scalers.
+
+        Both come from the shared band registry (:func:`get_passband`,
+        :func:`get_zero_point`), so each band is loaded and each zero point is
+        integrated once per process rather than once per target.
+        """
         band = None
         if brightness.locator_kind is LocatorKind.BAND:
-            band = Passband(f"{FILTER_SYSTEM.name}/{brightness.locator}")
+            band = get_passband(brightness.locator)
 
-        vegaspec = None
-        if (
-            brightness.amount_kind is AmountKind.MAG
-            and brightness.system is PhotometricSystem.VEGA
-        ):
-            vegaspec = _vega_reference()
+        zero_point = None
+        if brightness.amount_kind is AmountKind.MAG:
+            zero_point = get_zero_point(brightness.locator, brightness.system)
 
-        return synphot_flux_scale(
-            spectrum, brightness, band=band, vegaspec=vegaspec
+        return {"band": band, "zero_point": zero_point}
+
+    @staticmethod
+    def _brightness_group_key(brightness: Brightness) -> tuple:
+        """Everything of a brightness except its value, as a hashable key.
+
+        Brightnesses with equal keys share band, system and unit, so they can
+        be scaled together by :func:`~.flux_scaling.batch_flux_scale`.
+        """
+        locator = brightness.locator
+        if isinstance(locator, u.Quantity):
+            locator = (float(locator.value), locator.unit)
+        return (
+            brightness.locator_kind,
+            locator,
+            brightness.amount_kind,
+            brightness.system,
+            brightness.value.unit,
+            brightness.solid_angle,
         )
 
+    @staticmethod
+    def _get_spectrum_scales(
+        spectra: Mapping[int, SourceSpectrum],
+        refs: Sequence[int],
+        brightnesses: Sequence[Brightness] | Brightness,
+    ) -> np.ndarray:
+        """Vectorized :meth:`_get_spectrum_scale` for many point sources.
+
+        `brightnesses` is either one :class:`~.brightness.Brightness` per
+        source, or a single ``Brightness`` with an array ``value`` (the
+        columnar form, one amount per source). Per-source brightnesses are
+        grouped by everything but their value (see
+        :meth:`_brightness_group_key`); each group resolves its band once and
+        is scaled by :func:`~.flux_scaling.batch_flux_scale`, i.e. with one
+        synphot integration per unique template in the group.
+        """
+        refs = np.asarray(refs)
+        if isinstance(brightnesses, Brightness):
+            if brightnesses.is_surface_brightness:
+                raise BrightnessError(
+                    "E7", "surface brightness is invalid for a point source"
+                )
+            return batch_flux_scale(
+                spectra,
+                refs,
+                brightnesses.value,
+                brightnesses,
+                **SpectrumTarget._scale_references(brightnesses),
+            )
+
+        if len(refs) != len(brightnesses):
+            raise ValueError("refs and brightnesses must have the same length")
+
+        groups: dict[tuple, list[int]] = {}
+        for index, brightness in enumerate(brightnesses):
+            if brightness.is_surface_brightness:
+                raise BrightnessError(
+                    "E7", "surface brightness is invalid for a point source"
+                )
+            groups.setdefault(
+                SpectrumTarget._brightness_group_key(brightness), []
+            ).append(index)
+
+        scales = np.empty(len(refs))
+        for indices in groups.values():
+            brightness = brightnesses[indices[0]]
+            scales[indices] = batch_flux_scale(
+                spectra,
+                refs[indices],
+                [brightnesses[index].value.value for index in indices],
+                brightness,
+                **SpectrumTarget._scale_references(brightness),
+            )
+        return scales
+
     def _select_anchor_sed(self, spectrum: SourceSpectrum) -> SourceSpectrum:
         """Return the SED the flux scale should be applied to, per ``anchor``.
 
@@ -559,31 +781,64 @@ class SpectrumTarget(Target):
         ``self.brightness`` so a profile's SB->integrated reduction does not
         hide it.
         """
-        anchor = self.anchor
-        if anchor is AnchorFrame.ABSOLUTE:
-            if self.brightness.is_surface_brightness:
-                raise BrightnessError(
-                    "E11",
-                    "anchor: absolute with a surface-brightness amount -- "
-                    "surface brightness is distance-invariant",
-                )
-            distance = self._distance_or_none()
-            if distance is None:
-                raise BrightnessError(
-                    "E10",
-                    "anchor: absolute requires a position.distance (the "
-                    "distance modulus has no default)",
-                )
-
+        distance_factor = 1.0
+        if self.anchor is AnchorFrame.ABSOLUTE:
+            distance_factor = self._absolute_distance_factor([self.brightness])
         sed = self._select_anchor_sed(spectrum)
-        scale = self._get_spectrum_scale(sed, brightness)
+        return self._get_spectrum_scale(sed, brightness) * distance_factor
+
+    def _anchored_spectrum_scales(
+        self,
+        spectra: Mapping[int, SourceSpectrum],
+        refs: Sequence[int],
+        brightnesses: Sequence[Brightness] | Brightness,
+    ) -> np.ndarray:
+        """Vectorized :meth:`_anchored_spectrum_scale` for many point sources.
+
+        Same anchor semantics, applied to the per-target scales from
+        :meth:`_get_spectrum_scales` (which also documents the accepted
+        `brightnesses` forms); the anchor is a property of the whole
+        (multi-star) target, so the distance factor is shared.
+        """
+        distance_factor = 1.0
+        if self.anchor is AnchorFrame.ABSOLUTE:
+            distance_factor = self._absolute_distance_factor(
+                [brightnesses]
+                if isinstance(brightnesses, Brightness)
+                else brightnesses
+            )
+        seds = {
+            ref: self._select_anchor_sed(spectrum)
+            for ref, spectrum in spectra.items()
+        }
+        scales = self._get_spectrum_scales(seds, refs, brightnesses)
+        return scales * distance_factor
+
+    def _absolute_distance_factor(
+        self,
+        brightnesses: Sequence[Brightness],
+    ) -> float:
+        """Achromatic ``(10 pc / d)**2`` applied for ``anchor: absolute``.
 
-        if anchor is AnchorFrame.ABSOLUTE:
-            distance_factor = float(
-                ((10 * u.pc) / distance).to_value(u.dimensionless_unscaled) ** 2
+        Raises E11 if any of `brightnesses` is a surface brightness and E10 if
+        the target has no distance.
+        """
+        if any(brightness.is_surface_brightness for brightness in brightnesses):
+            raise BrightnessError(
+                "E11",
+                "anchor: absolute with a surface-brightness amount -- "
+                "surface brightness is distance-invariant",
+            )
+        distance = self._distance_or_none()
+        if distance is None:
+            raise BrightnessError(
+                "E10",
+                "anchor: absolute requires a position.distance (the "
+                "distance modulus has no default)",
             )
-            scale *= distance_factor
-        return scale
+        return float(
+            ((10 * u.pc) / distance).to_value(u.dimensionless_unscaled) ** 2
+        )
 
 
 # TODO: docstring
@@ -610,3 +865,27 @@ def length_angle_equivalency(distance: Distance | u.Quantity[u.pc]):
 # TODO: better name??
 def length_angle_context(distance: Distance | u.Quantity[u.pc]):
     return u.set_enabled_equivalencies(length_angle_equivalency(distance))
+
+
+def fov_mask(
+    x_arcsec: np.ndarray,
+    y_arcsec: np.ndarray,
+    optical_train,
+    margin: u.Quantity[u.arcsec] | float = 0,
+) -> np.ndarray:
+    """Boolean mask of the offsets inside the field of view.
+
+    The field of view is the ``width`` x ``height`` pixel grid of
+    `optical_train`, centered on the origin (as for the rendered extended
+    sources), grown by `margin` [arcsec if unitless] on every side. A margin
+    keeps sources just off the detector whose PSF wings still fall on it.
+    """
+    scale = (1 * u.pix).to_value(
+        u.arcsec, u.pixel_scale(optical_train["pixel_scale"])
+    )
+    margin = u.Quantity(margin, u.arcsec).value
+    half_width = optical_train["width"] * scale / 2 + margin
+    half_height = optical_train["height"] * scale / 2 + margin
+    return (
+        (np.abs(x_arcsec) <= half_width) & (np.abs(y_arcsec) <= half_height)
+    )
@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 """Custom composite types used in this package.
 
-Currently contains `POSITION_TYPE`, `SPECTRUM_TYPE` and `BRIGHTNESS_TYPE`,
-neither of which is final. These are kept here so that Target subclasses can
-simply import and use them, and when we eventually refine them, the code doesn't
-need to be updated everywhere.
+Currently contains `POSITION_TYPE`, `SPECTRUM_TYPE`, `BRIGHTNESS_TYPE`,
+`BASIS_TYPE` and `SEED_TYPE`, neither of which is final. These are kept here so
+that Target subclasses can simply import and use them, and when we eventually
+refine them, the code doesn't need to be updated everywhere.
 """
 
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Mapping, Sequence
+
+import numpy as np
 
 from astropy import units as u
 from astropy.coordinates import SkyCoord
@@ -29,3 +31,15 @@ SPECTRUM_TYPE = SourceSpectrum | SpectralType | str
 # ``str``/``Quantity``/number, so this stays deliberately loose at the top
 # level.
 BRIGHTNESS_TYPE = Sequence | Mapping
+
+# Spectral basis of an extended target with a spatially varying SED: a few
+# ``(spectrum, weights)`` pairs, where the weights are an array on the weight
+# map's pixel grid or a callable of the pixel-center coordinates ``(x, y)`` in
+# arcsec (see ``BrightnessProfile.to_source``).
+BASIS_TYPE = Sequence[
+    tuple[SPECTRUM_TYPE, np.ndarray | Callable[[np.ndarray, np.ndarray], np.ndarray]]
+]
+
+# Seed of a random sampling: anything ``np.random.SeedSequence`` accepts, or an
+# existing one (e.g. a spawned child) -- see ``stellar.sampling``.
+SEED_TYPE = int | Sequence[int] | np.random.SeedSequence | None
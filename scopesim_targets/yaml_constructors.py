@@ -17,6 +17,7 @@ in order to work with any YAML loader out-of-the-box.
 """
 
 import re
+from importlib import import_module
 
 import yaml
 import astropy.units as u
@@ -72,10 +73,25 @@ def register_coord() -> None:
     yaml.add_constructor("!Coord", coord_constructor, Loader=yaml.SafeLoader)
 
 
-def register_target_constructor(target_cls) -> None:
-    """Register mapping constructor for `target_cls`."""
+def register_target_constructor(target_cls: type | str) -> None:
+    """Register mapping constructor for `target_cls`.
+
+    `target_cls` may also be given as a ``"module.ClassName"`` string relative
+    to this package, in which case the module is only imported once the first
+    such tag is actually loaded. This keeps the YAML tag registration at
+    package import cheap.
+    """
+    if isinstance(target_cls, str):
+        module_name, _, cls_name = target_cls.rpartition(".")
+    else:
+        module_name, cls_name = None, target_cls.__name__
+
     def target_constructor(loader, node):
-        return target_cls(**loader.construct_mapping(node, deep=True))
-    yaml.add_constructor(f"!{target_cls.__name__}", target_constructor)
-    yaml.add_constructor(f"!{target_cls.__name__}", target_constructor,
+        cls = target_cls
+        if module_name is not None:
+            module = import_module(f".{module_name}", __package__)
+            cls = getattr(module, cls_name)
+        return cls(**loader.construct_mapping(node, deep=True))
+    yaml.add_constructor(f"!{cls_name}", target_constructor)
+    yaml.add_constructor(f"!{cls_name}", target_constructor,
                          Loader=yaml.SafeLoader)
@@ -2,5 +2,30 @@
 """Pytest global setup."""
 
 import pytest
+import numpy as np
 
 import scopesim_targets  # neccessary to have yaml represenations registered
+
+
+@pytest.fixture
+def offline_field(tmp_path, monkeypatch):
+    """Two local template files and an offline boxcar passband."""
+    from synphot import SpectralElement
+    from synphot.models import Box1D
+    import spextra
+    from scopesim_targets import target
+
+    band = SpectralElement(Box1D, amplitude=1, x_0=6500, width=1000)
+    monkeypatch.setattr(spextra, "Passband", lambda name: band)
+    target.get_passband.cache_clear()
+    target.get_zero_point.cache_clear()
+
+    wave = np.linspace(4000, 9000, 100)
+    paths = []
+    for i, slope in enumerate((1.0, 2.0)):
+        path = tmp_path / f"spec{i}.dat"
+        np.savetxt(path, np.column_stack([wave, slope * wave / 5000]))
+        paths.append(f"file:{path}")
+    yield paths
+    target.get_passband.cache_clear()
+    target.get_zero_point.cache_clear()
@@ -1,13 +1,20 @@
 # -*- coding: utf-8 -*-
 """Unit tests for cluster.py."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+import yaml
 from astropy import units as u
 from astropy.coordinates import SkyCoord
 
 from scopesim_targets.cluster import Cluster, ZeroAgeCluster
 from scopesim_targets.stellar.populations import IMFPopulation
-from scopesim_targets.stellar.morphology import KingProfileMorphology
+from scopesim_targets.stellar.morphology import (
+    KingProfileMorphology,
+    PlummerMorphology,
+)
+from scopesim_targets.stellar import sampling
 
 
 @pytest.fixture
@@ -29,3 +36,93 @@ class TestZeroAgeCluster:
     def test_to_source(self, basic_cluster):
         src = basic_cluster.to_source()
         assert len(src.fields[0].field) == 10
+
+    @pytest.mark.webtest  # because spextra templates need download
+    def test_to_source_fov_culling(self, basic_cluster):
+        # 10 x 10 arcsec FOV vs. a cluster of ~40 arcsec tidal radius
+        optical_train = {"pixel_scale": 1*u.arcsec/u.pix, "width": 10,
+                         "height": 10}
+        src = basic_cluster.to_source(optical_train, fov_margin=0)
+        tbl = src.fields[0].field
+        assert len(tbl) < 10
+        assert (abs(tbl["x"]) <= 5*u.arcsec).all()
+        assert (abs(tbl["y"]) <= 5*u.arcsec).all()
+
+
+class TestIMFPopulation:
+    @pytest.mark.webtest  # because spextra templates need download
+    def test_templates_only_for_drawn_types(self):
+        masses = [0.3, 0.3, 0.9, 5] * u.solMass
+        specref, spectra = IMFPopulation(4)._masses_to_spectra(masses)
+        assert len(spectra) == 3
+        assert specref[0] == specref[1]
+        assert sorted(spectra) == sorted(set(specref))
+
+    @pytest.mark.webtest  # because spextra templates need download
+    def test_empty_selection_keeps_a_template(self):
+        specref, spectra = IMFPopulation(4)._masses_to_spectra([] * u.solMass)
+        assert len(specref) == 0
+        assert len(spectra) == 1
+
+
+class TestSeed:
+    def test_same_seed_same_cluster(self):
+        clusters = [
+            ZeroAgeCluster(
+                SkyCoord(0*u.deg, 0*u.deg, 1*u.kpc),
+                IMFPopulation,
+                {"n_stars": 100},
+                KingProfileMorphology,
+                {"n_stars": 100, "r_core": 1*u.pc, "r_tide": 10*u.pc},
+                seed=42,
+            )
+            for _ in range(2)
+        ]
+        masses = [clu.population.sample_imf() for clu in clusters]
+        positions = [clu.morphology.sample(clu.position) for clu in clusters]
+        assert (masses[0] == masses[1]).all()
+        assert (positions[0][0] == positions[1][0]).all()
+        assert (positions[0][1] == positions[1][1]).all()
+
+    def test_explicit_component_seed_wins(self, basic_cluster):
+        tgt = ZeroAgeCluster(
+            basic_cluster.position,
+            IMFPopulation,
+            {"n_stars": 10, "seed": 7},
+            KingProfileMorphology,
+            {"n_stars": 10, "r_core": 1*u.pc, "r_tide": 10*u.pc},
+            seed=42,
+        )
+        assert (tgt.population.sample_imf()
+                == IMFPopulation(10, seed=7).sample_imf()).all()
+
+    def test_parallel_chunks_match_serial(self, monkeypatch):
+        monkeypatch.setattr(sampling, "CHUNK_SIZE", 16)
+        morph = KingProfileMorphology(100, 1*u.pc, 10*u.pc, seed=3)
+        position = SkyCoord(0*u.deg, 0*u.deg, 1*u.kpc)
+        serial_masses = IMFPopulation(100, seed=3).sample_imf()
+        serial_x, serial_y = morph.sample(position)
+        morph = KingProfileMorphology(100, 1*u.pc, 10*u.pc, seed=3)
+        with ThreadPoolExecutor(4) as executor:
+            masses = IMFPopulation(100, seed=3).sample_imf(executor)
+            x, y = morph.sample(position, executor)
+        assert (masses == serial_masses).all()
+        assert (x == serial_x).all()
+        assert (y == serial_y).all()
+
+
+def test_yaml_cluster_with_analytic_morphology():
+    tgt = yaml.full_load(
+        """
+        !ZeroAgeCluster
+        position: !Coord {ra: 0 deg, dec: 0 deg, distance: 1 kpc}
+        pop_class: IMFPopulation
+        pop_params: {n_stars: 10}
+        morph_class: PlummerMorphology
+        morph_params: {n_stars: 10, r_scale: 1 pc, axis_ratio: 0.5}
+        seed: 42
+        """
+    )
+    assert isinstance(tgt.morphology, PlummerMorphology)
+    x_arcsec, _ = tgt.morphology.sample(tgt.position)
+    assert len(x_arcsec) == 10
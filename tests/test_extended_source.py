@@ -16,7 +16,13 @@ import numpy as np
 from numpy import testing as npt
 import astropy.units as u
 
-from scopesim_targets.extended_source import Box, Disk, Ring, Sersic, Flat
+from astropy.wcs import WCS
+
+from scopesim_targets import extended_source
+from scopesim_targets.extended_source import (
+    BrightnessProfile, Box, Disk, Ring, Sersic, Gaussian, Flat,
+    CompositeProfile,
+)
 from scopesim_targets.brightness import (
     BrightnessError,
     parse_brightness,
@@ -155,6 +161,187 @@ class TestWeightMap:
         assert np.allclose(wm, wm.flat[0])
 
 
+class TestCutout:
+    """Cutout weight maps: a pixel-aligned slice of the full-frame one."""
+
+    LARGE = {"pixel_scale": 0.2 * u.arcsec / u.pixel, "width": 1001, "height": 800}
+
+    @pytest.mark.parametrize("target", [
+        Box(params={"x_width": 6, "y_width": 4}),
+        Disk(params={"R_0": 3}),
+        Ring(params={"r_in": 2, "width": 1}),
+        Sersic(params={"r_eff": 0.5, "n": 1, "ellip": 0.3, "theta": 0.5}),
+        Gaussian(params={"x_stddev": 1, "y_stddev": 0.5, "theta": 0.3}),
+    ], ids=["box", "disk", "ring", "sersic", "gaussian"])
+    def test_cutout_is_slice_of_full_frame(self, target):
+        full, full_hdr = target._weightmap(self.LARGE)
+        cut, cut_hdr = target._weightmap(self.LARGE, cutout=True)
+        rows, cols = target._cutout_window(self.LARGE)
+
+        assert cut.size < full.size / 100
+        npt.assert_allclose(cut, full[rows, cols], rtol=0, atol=1e-15)
+        # Normalization still comes from the analytic total: only the (tiny)
+        # wings beyond the window are missing, never redistributed.
+        assert -1e-12 < full.sum() - cut.sum() <= target._cutout_flux_loss
+        # The WCS puts the cutout on the same sky pixels.
+        npt.assert_allclose(
+            WCS(cut_hdr).pixel_to_world_values(0, 0),
+            WCS(full_hdr).pixel_to_world_values(cols.start, rows.start),
+        )
+        assert cut_hdr["BUNIT"] == ""
+
+    def test_window_clipped_to_frame(self, grid):
+        # A profile larger than the FOV cannot grow the frame.
+        disk = Disk(params={"R_0": 100})
+        cut, _ = disk._weightmap(grid, cutout=True)
+        npt.assert_array_equal(cut, disk._weightmap(grid)[0])
+
+    def test_no_extent_renders_full_frame(self, grid):
+        # Non-integrable (and boxy Sersic) profiles have no cutout extent.
+        assert Flat()._cutout_window(grid) is None
+        assert Sersic(params={"r_eff": 2, "n": 1, "c": 0.5})._extent() is None
+        wm, _ = Flat()._weightmap(grid, cutout=True)
+        assert wm.shape == (grid["height"], grid["width"])
+
+
+class TestWeightMapCache:
+    """Weight maps are memoized on profile params and grid only."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        BrightnessProfile.clear_weightmap_cache()
+        yield
+        BrightnessProfile.clear_weightmap_cache()
+
+    def test_same_profile_and_grid_hits(self, grid):
+        first, _ = Sersic(params={"r_eff": 5, "n": 4})._weightmap(grid)
+        # Equal params in another unit and another instance: same key.
+        second, _ = Sersic(params={"r_eff": 5 * u.arcsec, "n": 4})._weightmap(
+            grid
+        )
+        info = BrightnessProfile.weightmap_cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        assert second is first
+        assert not first.flags.writeable
+
+    def test_brightness_does_not_enter_key(self, grid):
+        # A brightness sweep reuses one render (set directly, bypassing the
+        # network-backed FilterSystem band check).
+        sersic = Sersic(params={"r_eff": 5, "n": 4})
+        first, _ = sersic._weightmap(grid)
+        sersic._brightness = parse_brightness(("V", 20 * u.mag / u.arcsec**2))
+        assert sersic._weightmap(grid)[0] is first
+
+    @pytest.mark.parametrize("change", [
+        lambda t, g: (Sersic(params={"r_eff": 5, "n": 3}), g),
+        lambda t, g: (Disk(params={"R_0": 5}), g),
+        lambda t, g: (t, {**g, "width": 32}),
+        lambda t, g: (t, {**g, "pixel_scale": 0.5 * u.arcsec / u.pixel}),
+    ], ids=["params", "class", "width", "pixel_scale"])
+    def test_key_changes_miss(self, grid, change):
+        sersic = Sersic(params={"r_eff": 5, "n": 4})
+        sersic._weightmap(grid)
+        target, new_grid = change(sersic, grid)
+        target._weightmap(new_grid)
+        assert BrightnessProfile.weightmap_cache_info().misses == 2
+
+    def test_oversample_and_cutout_enter_key(self, grid):
+        sersic = Sersic(params={"r_eff": 1, "n": 1})
+        full, _ = sersic._weightmap(grid)
+        assert sersic._weightmap(grid, cutout=True)[0].shape != full.shape
+        sersic._oversample = 1
+        sersic._weightmap(grid)
+        assert BrightnessProfile.weightmap_cache_info().misses == 3
+
+    def test_header_is_a_copy(self, grid):
+        box = Box(params={"x_width": 6, "y_width": 4})
+        _, hdr = box._weightmap(grid)
+        hdr["CRVAL1"] += 1
+        assert box._weightmap(grid)[1]["CRVAL1"] == 0
+
+    def test_disk_store_round_trip(self, grid, tmp_path, monkeypatch):
+        monkeypatch.setattr(extended_source, "WEIGHTMAP_CACHE_DIR", tmp_path)
+        box = Box(params={"x_width": 6, "y_width": 4})
+        rendered, rendered_hdr = box._weightmap(grid, cutout=True)
+        assert len(list(tmp_path.glob("*.fits"))) == 1
+        assert not list(tmp_path.glob("*.part"))
+
+        BrightnessProfile.clear_weightmap_cache()
+        loaded, loaded_hdr = box._weightmap(grid, cutout=True)
+        npt.assert_array_equal(loaded, rendered)
+        assert loaded.dtype == rendered.dtype
+        assert list(loaded_hdr.items()) == list(rendered_hdr.items())
+
+    def test_disk_store_writers_use_own_files(self, grid, tmp_path,
+                                              monkeypatch):
+        # Two writers missing on the same key must not share a temporary
+        # file; a failed render leaves none behind.
+        monkeypatch.setattr(extended_source, "WEIGHTMAP_CACHE_DIR", tmp_path)
+        partials = []
+
+        def render(self, optical_train, cutout, dtype, path):
+            partials.append(path)
+            raise RuntimeError("interrupted")
+
+        monkeypatch.setattr(Box, "_render_weightmap", render)
+        box = Box(params={"x_width": 6, "y_width": 4})
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                box._weightmap(grid)
+        assert partials[0] != partials[1]
+        assert not list(tmp_path.iterdir())
+
+
+class TestWeightMapMemory:
+    """Output dtype, strip-wise rendering and memory-mapped output."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        BrightnessProfile.clear_weightmap_cache()
+        yield
+        BrightnessProfile.clear_weightmap_cache()
+
+    def test_default_dtype_by_frame_size(self, grid, monkeypatch):
+        box = Box(params={"x_width": 6, "y_width": 4})
+        assert box._weightmap(grid)[0].dtype == np.float64
+        monkeypatch.setattr(extended_source, "FLOAT32_MIN_PIXELS", 64 * 64)
+        assert box._weightmap(grid)[0].dtype == np.float32
+        assert box._weightmap(grid, dtype="float64")[0].dtype == np.float64
+
+    @pytest.mark.parametrize("target", [
+        Sersic(params={"r_eff": 5, "n": 4}),
+        Disk(params={"R_0": 7}),
+        Gaussian(params={"x_stddev": 3, "y_stddev": 2, "theta": 0.4}),
+    ], ids=["sersic", "disk", "gaussian"])
+    def test_float32_matches_float64(self, grid, target):
+        single, _ = target._weightmap(grid, dtype=np.float32)
+        double, _ = target._weightmap(grid, dtype=np.float64)
+        npt.assert_allclose(single, double, rtol=1e-6, atol=1e-12)
+
+    @pytest.mark.parametrize("target", [
+        Sersic(params={"r_eff": 5, "n": 4}),
+        Ring(params={"r_in": 5, "width": 3}),
+        Gaussian(params={"x_stddev": 3, "y_stddev": 2}),
+    ], ids=["sersic", "ring", "gaussian"])
+    def test_row_strips_do_not_change_the_image(self, grid, target):
+        whole = target._render_image(grid)
+        target._strip_pixels = 5 * grid["width"]  # 13 strips, last one short
+        npt.assert_array_equal(target._render_image(grid), whole)
+
+    def test_render_straight_to_fits_file(self, grid, tmp_path):
+        from astropy.io import fits
+        sersic = Sersic(params={"r_eff": 5, "n": 4})
+        in_memory, hdr = sersic._render_weightmap(grid, dtype=np.float32)
+        path = tmp_path / "weightmap.fits"
+        sersic._render_weightmap(grid, dtype=np.float32, path=path)
+
+        with fits.open(path) as hdul:
+            hdul.verify("exception")
+            npt.assert_array_equal(hdul[0].data, in_memory)
+            assert hdul[0].header["CRPIX1"] == hdr["CRPIX1"]
+            assert hdul[0].header["BUNIT"] == ""
+
+
 class TestSurfaceBrightness:
     """Case II reduction (pure): SB -> implied integrated mag over the effective
     area. Brightness is set directly (bypassing the FilterSystem band check) so
@@ -299,6 +486,196 @@ class TestToSource:
         assert flat.to_source(grid) is not None
 
 
+class TestCompositeProfile:
+    """Several profiles as one target: components, placement, grouping."""
+
+    def test_components_must_be_profiles(self):
+        with pytest.raises(TypeError, match="brightness profiles"):
+            CompositeProfile(components=[Sersic(), "disk"])
+
+    def test_needs_components(self):
+        with pytest.raises(ValueError, match="at least one"):
+            CompositeProfile(components=[])
+
+    def test_placement_does_not_modify_components(self):
+        bulge = Sersic(params={"r_eff": 1, "n": 4})
+        galaxy = CompositeProfile(position=(0, 0), components=[bulge])
+        placed, = galaxy._placed_components()
+        assert placed is not bulge
+        assert placed.position == galaxy.position
+        assert getattr(bulge, "_position", None) is None
+
+    def test_yaml_tag(self):
+        import yaml
+        galaxy = yaml.full_load("""
+            !CompositeProfile
+            components:
+              - !Sersic {params: {r_eff: 1, n: 4}}
+              - !Disk {params: {R_0: 5}}
+        """)
+        assert isinstance(galaxy, CompositeProfile)
+        assert [type(c) for c in galaxy.components] == [Sersic, Disk]
+
+    @pytest.mark.webtest
+    def test_one_weightmap_per_spectrum(self, grid):
+        # Disk and ring share a template: one summed map, weighted by their
+        # relative flux scales, so the total flux equals that of the three
+        # separate sources.
+        components = [
+            Sersic(spectrum="K0III", brightness=["V", 16],
+                   params={"r_eff": 1, "n": 4}),
+            Sersic(spectrum="A0V", brightness=["V", 15],
+                   params={"r_eff": 3, "n": 1, "ellip": 0.4}),
+            Ring(spectrum="A0V", brightness=["V", 18],
+                 params={"r_in": 8, "width": 1}),
+        ]
+        source = CompositeProfile(components=components).to_source(grid)
+        assert len(source.fields) == 2
+        assert sorted(source.spectra) == [0, 1]
+
+        wave = np.linspace(4000, 9000, 20) * u.AA
+
+        def total_flux(src):
+            return sum(
+                field.data.sum() * field.spectrum(wave).value
+                for field in src.fields
+            )
+
+        npt.assert_allclose(
+            total_flux(source),
+            sum(total_flux(c.to_source(grid)) for c in components),
+            rtol=1e-10,
+        )
+
+    @pytest.fixture
+    def components(self, offline_field):
+        # The last two share a template: one summed map, weighted by their
+        # relative flux scales.
+        spec0, spec1 = offline_field
+        return [
+            Sersic(spectrum=spec0, brightness=["R", 16 * u.ABmag],
+                   params={"r_eff": 1, "n": 4}),
+            Sersic(spectrum=spec1, brightness=["R", 15 * u.ABmag],
+                   params={"r_eff": 3, "n": 1, "ellip": 0.4}),
+            Ring(spectrum=spec1, brightness=["R", 18 * u.ABmag],
+                 params={"r_in": 8, "width": 1}),
+        ]
+
+    @staticmethod
+    def _total_flux(maps):
+        wave = np.linspace(4000, 9000, 20) * u.AA
+        return sum(
+            weightmap.sum() * spectrum(wave).value
+            for weightmap, _, spectrum in maps
+        )
+
+    def test_grouping_conserves_flux_offline(self, grid, components):
+        maps = CompositeProfile(components=components)._weightmaps(grid)
+        assert len(maps) == 2
+        npt.assert_allclose(
+            self._total_flux(maps),
+            sum(
+                self._total_flux(CompositeProfile(components=[c])
+                                 ._weightmaps(grid))
+                for c in components
+            ),
+            rtol=1e-10,
+        )
+
+    def test_templates_outlive_grouping(self, grid, components, monkeypatch):
+        # Groups are keyed on template identity. An uncached template whose
+        # redshifted copy is kept must stay alive until all components are
+        # grouped, otherwise a later template could reuse its id.
+        import gc
+        import weakref
+        from synphot import SourceSpectrum
+
+        templates = []
+
+        def resolve(spectrum, brightness=None):
+            template = SourceSpectrum.from_file(spectrum.removeprefix("file:"))
+            templates.append(weakref.ref(template))
+            return template
+
+        weightmap = BrightnessProfile._weightmap
+
+        def checked_weightmap(self, *args, **kwargs):
+            gc.collect()
+            assert all(template() is not None for template in templates)
+            return weightmap(self, *args, **kwargs)
+
+        def redshift(spectrum, position):
+            return spectrum * 1  # a copy, as for a real redshift
+
+        monkeypatch.setattr(BrightnessProfile, "resolve_spectrum",
+                            staticmethod(resolve))
+        monkeypatch.setattr(BrightnessProfile, "redshift_spectrum",
+                            staticmethod(redshift))
+        monkeypatch.setattr(BrightnessProfile, "_weightmap", checked_weightmap)
+        galaxy = CompositeProfile(position=(0, 0), components=components)
+        assert len(galaxy._weightmaps(grid)) == 3
+
+
+    def test_components_at_different_positions_not_grouped(
+        self, grid, components, monkeypatch,
+    ):
+        # Without a composite position the components keep their own, and
+        # with them possibly different redshifts of the same template.
+        from astropy.coordinates import SkyCoord
+
+        monkeypatch.setattr(BrightnessProfile, "redshift_spectrum",
+                            staticmethod(lambda spectrum, position: spectrum))
+        disk, ring = components[1:]
+        disk.position = SkyCoord(0 * u.deg, 0 * u.deg, 1 * u.Mpc)
+        ring.position = SkyCoord(0 * u.deg, 0 * u.deg, 2 * u.Mpc)
+        galaxy = CompositeProfile(components=components)
+        assert len(galaxy._weightmaps(grid)) == 3
+
+        ring.position = disk.position
+        assert len(galaxy._weightmaps(grid)) == 2
+
+
+class TestSpectralBasis:
+    """Spatially varying SED as a few basis spectra with per-pixel weights."""
+
+    @pytest.fixture
+    def target(self):
+        return Sersic(brightness=["V", 15], params={"r_eff": 3, "n": 2})
+
+    def test_needs_basis_spectra(self, target, grid):
+        with pytest.raises(ValueError, match="at least one"):
+            target._basis_weightmaps(grid, [])
+
+    def test_negative_weights(self, target, grid):
+        with pytest.raises(ValueError, match="negative"):
+            target._basis_weightmaps(grid, [("A0V", 1), ("K0III", -1)])
+
+    def test_weights_vanish_on_flux(self, target, grid):
+        basis = [("A0V", lambda x, y: (x > 0).astype(float))]
+        with pytest.raises(ValueError, match="vanish"):
+            target._basis_weightmaps(grid, basis)
+
+    @pytest.mark.webtest
+    def test_fractions_sum_to_weightmap(self, target, grid):
+        # An old core in a young disk: the fractions split each pixel, and
+        # every basis spectrum carries the profile's full band flux.
+        basis = [
+            ("K0III", lambda x, y: np.exp(-np.hypot(x, y) / 2)),
+            ("A0V", 0.3),
+        ]
+        maps = target._basis_weightmaps(grid, basis, cutout=True)
+        weightmap, _ = target._weightmap(grid, cutout=True)
+        npt.assert_allclose(sum(m for m, _, _ in maps), weightmap, rtol=1e-12)
+        core, disk = (m for m, _, _ in maps)
+        center = np.unravel_index(weightmap.argmax(), weightmap.shape)
+        assert core[center] > disk[center]
+        assert core[0, 0] < disk[0, 0]
+
+        source = target.to_source(grid, basis=basis)
+        assert len(source.fields) == 2
+        assert sorted(source.spectra) == [0, 1]
+
+
 class TestAnchorOnProfiles:
     """Anchor-frame behaviour specific to extended (surface-brightness) targets."""
 
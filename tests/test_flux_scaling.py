@@ -8,6 +8,9 @@ constant reference spectrum -- so the whole flux-authority dispatch is exercised
 offline against real synphot.
 """
 
+from dataclasses import replace
+from unittest.mock import patch
+
 import numpy as np
 from numpy import testing as npt
 import pytest
@@ -24,7 +27,11 @@ from scopesim_targets.brightness import (
     PhotometricSystem,
     BrightnessError,
 )
-from scopesim_targets.flux_scaling import synphot_flux_scale
+from scopesim_targets.flux_scaling import (
+    synphot_flux_scale,
+    batch_flux_scale,
+    zero_point_flux,
+)
 
 
 @pytest.fixture
@@ -163,3 +170,97 @@ class TestGuards:
         b = parse_brightness(("K", 3.5*u.mJy))
         with pytest.raises(ValueError):
             synphot_flux_scale(flat_spec, b, band=None)
+
+
+class TestBatchFluxScale:
+    """Batched scales equal per-target scales, at one integration per ref."""
+
+    @pytest.fixture
+    def spectra(self, flat_spec):
+        return {0: flat_spec, 1: flat_spec * 3.0}
+
+    @pytest.mark.parametrize("spec", [
+        ("R", 15*u.mag),
+        ("R", 10.5*u.ABmag),
+        ("K", 3.5*u.mJy),
+        ("V", 2e-15*u.W/u.m**2),
+        (656.3*u.nm, 1.2e-16*u.erg/(u.s*u.cm**2*u.AA)),
+    ])
+    def test_matches_scalar(self, spec, spectra, band, vega):
+        b = parse_brightness(spec)
+        kwargs = {"vegaspec": vega} if b.system is PhotometricSystem.VEGA else {}
+        if b.locator_kind is LocatorKind.BAND:
+            kwargs["band"] = band
+        refs = np.array([0, 1, 1, 0])
+        values = b.value.value + np.array([0.0, 1.5, -2.0, 3.0])
+        expected = [
+            synphot_flux_scale(
+                spectra[ref], replace(b, value=value * b.value.unit), **kwargs
+            )
+            for ref, value in zip(refs, values)
+        ]
+        got = batch_flux_scale(spectra, refs, values, b, **kwargs)
+        npt.assert_allclose(got, expected, rtol=1e-12)
+
+    def test_one_observation_per_template(self, spectra, band):
+        b = parse_brightness(("R", 10.5*u.ABmag))
+        refs = np.array([0, 1] * 50)
+        with patch("scopesim_targets.flux_scaling.Observation",
+                   wraps=Observation) as observation:
+            batch_flux_scale(spectra, refs, np.full(100, 12.0), b, band=band)
+        assert observation.call_count == 2
+
+    def test_empty(self, spectra, band):
+        b = parse_brightness(("R", 10.5*u.ABmag))
+        got = batch_flux_scale(spectra, [], [], b, band=band)
+        assert got.shape == (0,)
+
+    def test_shape_mismatch_raises(self, spectra, band):
+        b = parse_brightness(("R", 10.5*u.ABmag))
+        with pytest.raises(ValueError):
+            batch_flux_scale(spectra, [0, 1], [12.0], b, band=band)
+
+
+class TestZeroPoint:
+    """A precomputed zero point reproduces synphot's per-system ``effstim``."""
+
+    @pytest.mark.parametrize("spec", [
+        ("R", 15*u.mag),
+        ("R", 10.5*u.ABmag),
+        ("R", 18*u.STmag),
+    ])
+    def test_matches_effstim_path(self, spec, flat_spec, band, vega):
+        b = parse_brightness(spec)
+        zero_point = zero_point_flux(band, b.system, vegaspec=vega)
+        npt.assert_allclose(
+            synphot_flux_scale(flat_spec, b, band=band, zero_point=zero_point),
+            synphot_flux_scale(flat_spec, b, band=band, vegaspec=vega),
+            rtol=1e-9,
+        )
+
+    def test_zero_mag_source_has_zero_mag(self, band):
+        zero_ab = SourceSpectrum(ConstFlux1D, amplitude=0*u.ABmag)
+        obs = Observation(zero_ab, band)
+        npt.assert_allclose(
+            obs.effstim(units.FLAM).value,
+            zero_point_flux(band, PhotometricSystem.AB).value,
+            rtol=1e-9,
+        )
+
+    def test_vega_requires_spectrum(self, band):
+        with pytest.raises(ValueError):
+            zero_point_flux(band, PhotometricSystem.VEGA)
+
+    def test_batch_with_zero_point(self, flat_spec, band, vega):
+        b = parse_brightness(("R", 15*u.mag))
+        zero_point = zero_point_flux(band, b.system, vegaspec=vega)
+        got = batch_flux_scale(
+            {0: flat_spec}, [0, 0], [15.0, 16.0], b,
+            band=band, zero_point=zero_point,
+        )
+        npt.assert_allclose(
+            got,
+            [synphot_flux_scale(flat_spec, b, band=band, vegaspec=vega)]
+            * np.array([1, 10**-0.4]),
+            rtol=1e-9,
+        )
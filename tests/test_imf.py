@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for stellar/imf.py."""
+
+import pytest
+import numpy as np
+from scipy.stats import rv_continuous
+from scipy.stats.sampling import NumericalInversePolynomial
+
+from scopesim_targets.stellar import imf
+
+
+@pytest.fixture(scope="module")
+def kroupa():
+    return imf.DEFAULT_IMFS["kroupa02"]
+
+
+class _Salpeter(rv_continuous):
+    """Shape-free Salpeter IMF, used unfrozen."""
+
+    def _pdf(self, x):
+        total = (self.a**-1.35 - self.b**-1.35) / 1.35
+        return x**-2.35 / total
+
+
+class TestInverseCDF:
+    @pytest.mark.parametrize(
+        "params",
+        (
+            {},  # Kroupa 2002 defaults
+            {"a1": 1.0},  # logarithmic segment
+            {"m3": 80.0},  # break beyond the support
+        ),
+    )
+    def test_broken_powerlaw_matches_numerical_inversion(self, kroupa, params):
+        frozen = imf.kroupa_gen(**(kroupa.kwds | params))
+        quantiles = np.linspace(1e-6, 1 - 1e-6, 1001)
+        numerical = NumericalInversePolynomial(
+            frozen, center=0.1, u_resolution=1e-12
+        ).ppf(quantiles)
+        closed_form = imf._inverse_cdf(imf._imf_key(frozen))(quantiles)
+        np.testing.assert_allclose(closed_form, numerical, rtol=1e-8)
+
+    def test_support_bounds(self, kroupa):
+        inverse_cdf = imf._inverse_cdf(imf._imf_key(kroupa))
+        np.testing.assert_allclose(inverse_cdf([0.0, 1.0]), [0.01, 60])
+
+    def test_cached_per_parameters(self, kroupa):
+        key = imf._imf_key(kroupa)
+        assert imf._inverse_cdf(key) is imf._inverse_cdf(key)
+        other = imf._imf_key(imf.kroupa_gen(**(kroupa.kwds | {"a3": 2.7})))
+        assert imf._inverse_cdf(other) is not imf._inverse_cdf(key)
+
+
+class TestSampleMasses:
+    @pytest.mark.parametrize("name", ["kroupa02", "chabrier01", "chabrier03"])
+    def test_within_support_and_seeded(self, name):
+        dist = imf.DEFAULT_IMFS[name]
+        masses = imf.sample_masses(dist, 1000, rng=42)
+        assert masses.shape == (1000,)
+        assert ((masses >= 0.01) & (masses <= 60)).all()
+        np.testing.assert_array_equal(
+            masses, imf.sample_masses(dist, 1000, rng=42)
+        )
+
+    def test_unfrozen_distribution(self):
+        salpeter = _Salpeter(a=0.1, b=100)
+        masses = imf.sample_masses(salpeter, 1000, rng=42)
+        np.testing.assert_array_equal(
+            masses, imf.sample_masses(salpeter(), 1000, rng=42)
+        )
+        assert ((masses >= 0.1) & (masses <= 100)).all()
+        assert imf.mean_mass(salpeter) == pytest.approx(salpeter.expect())
+
+    @pytest.mark.parametrize("dist", [np.ones(3), "kroupa02"])
+    def test_rejects_non_distributions(self, dist):
+        with pytest.raises(TypeError, match="scipy.stats"):
+            imf.sample_masses(dist, 10)
+
+    def test_mean_matches_expectation(self, kroupa):
+        masses = imf.sample_masses(kroupa, 10**6, rng=1)
+        assert masses.mean() == pytest.approx(imf.mean_mass(kroupa), rel=0.02)
+
+
+class TestMeanMass:
+    def test_memoized_expect(self, kroupa):
+        assert imf.mean_mass(kroupa) == pytest.approx(kroupa.expect())
+        hits = imf._mean_mass.cache_info().hits
+        imf.mean_mass(kroupa)
+        assert imf._mean_mass.cache_info().hits == hits + 1
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Import-time regression tests for the lazy loading of heavy dependencies."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY_MODULES = ("scopesim", "spextra", "synphot", "scipy.stats", "matplotlib")
+
+
+def _loaded_after(statement: str) -> list[str]:
+    """Heavy modules loaded by `statement` in a fresh interpreter."""
+    script = (
+        f"import sys, json\n{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+class TestLazyImport:
+    def test_package_import_is_light(self):
+        assert _loaded_after("import scopesim_targets") == []
+
+    def test_yaml_tags_registered_lazily(self):
+        statement = (
+            "import yaml, scopesim_targets\n"
+            "assert '!Star' in yaml.SafeLoader.yaml_constructors\n"
+            "assert '!ZeroAgeCluster' in yaml.SafeLoader.yaml_constructors"
+        )
+        assert _loaded_after(statement) == []
+
+    @pytest.mark.parametrize("module", ["point_source", "extended_source"])
+    def test_target_modules_defer_spextra_and_scopesim(self, module):
+        loaded = _loaded_after(f"import scopesim_targets.{module}")
+        assert "spextra" not in loaded
+        assert "scopesim" not in loaded
+
+    def test_submodule_attribute_access(self):
+        import scopesim_targets
+        from scopesim_targets import point_source, target
+        assert scopesim_targets.point_source is point_source
+        assert scopesim_targets.Target is target.Target
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for stellar/morphology.py."""
+
+import pytest
+import numpy as np
+from astropy import units as u
+from astropy.coordinates import SkyCoord
+
+from scopesim_targets.stellar import morphology
+
+
+def _skycoord_offsets(parent_position, position_angle, separation):
+    local_positions = parent_position.directional_offset_by(
+        position_angle * u.rad, separation * u.rad,
+    ).transform_to(parent_position.skyoffset_frame())
+    return (
+        local_positions.lon.to_value(u.arcsec),
+        local_positions.lat.to_value(u.arcsec),
+    )
+
+
+class TestLocalOffsets:
+    @pytest.mark.parametrize("max_separation", [5e-5, 1e-2, 1.0])
+    @pytest.mark.parametrize("dec", [0, -45, 89.9])
+    def test_matches_skycoord(self, max_separation, dec):
+        rng = np.random.default_rng(42)
+        position_angle = rng.uniform(-np.pi, np.pi, 1000)
+        separation = rng.uniform(0, max_separation, 1000)
+        parent_position = SkyCoord(30 * u.deg, dec * u.deg)
+
+        x_arcsec, y_arcsec = morphology.local_offsets(
+            position_angle, separation
+        )
+        x_expected, y_expected = _skycoord_offsets(
+            parent_position, position_angle, separation
+        )
+        np.testing.assert_allclose(x_arcsec, x_expected, rtol=0, atol=1e-5)
+        np.testing.assert_allclose(y_arcsec, y_expected, rtol=0, atol=1e-5)
+
+    def test_empty(self):
+        x_arcsec, y_arcsec = morphology.local_offsets(
+            np.array([]), np.array([])
+        )
+        assert len(x_arcsec) == len(y_arcsec) == 0
+
+
+class TestKingProfileMorphology:
+    def test_sample_within_tidal_radius(self):
+        morph = morphology.KingProfileMorphology(
+            1000, r_core=1 * u.pc, r_tide=10 * u.pc, seed=1
+        )
+        position = SkyCoord(0 * u.deg, 0 * u.deg, 1 * u.kpc)
+        x_arcsec, y_arcsec = morph.sample(position)
+        # 10 pc at 1 kpc are about 2063 arcsec
+        assert (np.hypot(x_arcsec, y_arcsec) <= 2063).all()
+
+
+CLUSTER_POSITION = SkyCoord(0 * u.deg, 0 * u.deg, 1 * u.kpc)
+PC_ARCSEC = 206.264806  # 1 pc at 1 kpc
+
+
+def _sample_pc(morph):
+    x_arcsec, y_arcsec = morph.sample(CLUSTER_POSITION)
+    return x_arcsec / PC_ARCSEC, y_arcsec / PC_ARCSEC
+
+
+class TestEllipticalMorphologies:
+    @pytest.mark.parametrize("three_d", [False, True])
+    def test_plummer_half_mass_radius(self, three_d):
+        morph = morphology.PlummerMorphology(
+            10**5, r_scale=1 * u.pc, three_d=three_d, seed=1
+        )
+        # Projected half-mass radius of a Plummer profile is its scale radius
+        assert np.median(np.hypot(*_sample_pc(morph))) == pytest.approx(
+            1, rel=0.02
+        )
+
+    @pytest.mark.parametrize("three_d", [False, True])
+    def test_plummer_truncated(self, three_d):
+        morph = morphology.PlummerMorphology(
+            10**4, r_scale=1 * u.pc, r_max=2 * u.pc, three_d=three_d, seed=1
+        )
+        assert np.hypot(*_sample_pc(morph)).max() <= 2
+
+    def test_eff_half_mass_radius(self):
+        morph = morphology.EFFMorphology(
+            10**5, r_scale=1 * u.pc, gamma=3, seed=1
+        )
+        # 1 - (1 + R**2)**(-1/2) = 1/2 for R = sqrt(3)
+        assert np.median(np.hypot(*_sample_pc(morph))) == pytest.approx(
+            np.sqrt(3), rel=0.02
+        )
+
+    def test_eff_rejects_shallow_profile(self):
+        with pytest.raises(ValueError):
+            morphology.EFFMorphology(10, r_scale=1 * u.pc, gamma=2)
+
+    def test_elliptical_gaussian(self):
+        morph = morphology.GaussianMorphology(
+            10**5, sigma=1 * u.pc, axis_ratio=0.5,
+            position_angle=90 * u.deg, seed=1,
+        )
+        x_pc, y_pc = _sample_pc(morph)
+        # Major axis points east, i.e. along x
+        assert x_pc.std() == pytest.approx(1, rel=0.02)
+        assert y_pc.std() == pytest.approx(0.5, rel=0.02)
+
+    @pytest.mark.parametrize("axis_ratio", [0, 1.5])
+    def test_rejects_invalid_axis_ratio(self, axis_ratio):
+        with pytest.raises(ValueError):
+            morphology.GaussianMorphology(10, sigma=1 * u.pc,
+                                          axis_ratio=axis_ratio)
+
+    @pytest.mark.parametrize("dimension", [1.6, 3])
+    def test_fractal_within_radius(self, dimension):
+        morph = morphology.FractalMorphology(
+            1000, radius=5 * u.pc, fractal_dimension=dimension, seed=1
+        )
+        x_pc, y_pc = _sample_pc(morph)
+        assert len(x_pc) == 1000
+        # Leaf cubes are inside the sphere, stars spread over the cubes
+        assert np.hypot(x_pc, y_pc).max() <= 5 * 1.1
+
+    def test_fractal_seeded(self):
+        samples = [
+            _sample_pc(morphology.FractalMorphology(100, 5 * u.pc, seed=1))
+            for _ in range(2)
+        ]
+        assert (samples[0][0] == samples[1][0]).all()
+        assert (samples[0][1] == samples[1][1]).all()
+
+    def test_fractal_rejects_invalid_dimension(self):
+        with pytest.raises(ValueError):
+            morphology.FractalMorphology(10, 5 * u.pc, fractal_dimension=3.5)
+
+    def test_to_source_columns(self):
+        morph = morphology.PlummerMorphology(10, r_scale=1 * u.pc)
+        assert set(morph.to_source_columns(CLUSTER_POSITION)) == {"x", "y"}
@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 """Unit tests for point_source.py."""
 
+from dataclasses import replace
 from unittest.mock import patch
 
 import pytest
 import yaml
 import numpy as np
 from astropy import units as u
+from astropy.coordinates import SkyCoord
+from astropy.table import Table, vstack
+from astropy.utils.masked import Masked
 
 from scopesim_targets.brightness import parse_brightness
 from scopesim_targets.point_source import (
@@ -278,3 +282,264 @@ class TestStarField:
             tgt.spectra = ["A0V", "G2V"]
         with pytest.raises(ValueError):
             tgt.brightnesses = [5 * u.mag, 6 * u.mag]
+
+
+class TestColumnarStarField:
+    def test_columns_are_parsed_once(self):
+        tgt = StarField(
+            positions={"x": np.array([0., 1., 2.]), "y": np.zeros(3)},
+            spectra=np.array(["A0V", "G2V", "a0v"]),
+            brightnesses=np.array([5., 8., 6.]),
+            band="R",
+        )
+        assert len(tgt.positions) == 3
+        assert tgt.positions.isscalar is False
+        assert tgt.spectra == ["A0V", "G2V", "A0V"]
+        np.testing.assert_array_equal(tgt._spectrum_refs, [0, 1, 0])
+        assert tgt.brightnesses.value.shape == (3,)
+
+    @pytest.mark.parametrize("positions", (
+        np.array([[0, 0], [0, 1]]),
+        {"x": [0, 0], "y": [0, 1]},
+        {"ra": [0, 0] * u.arcsec, "dec": [0, 1] * u.arcsec},
+    ))
+    def test_position_forms(self, positions):
+        tgt = StarField(positions=positions, band="R")
+        x_arcsec, y_arcsec = tgt._xy_arcsec_positions(
+            tgt.positions,
+            SkyCoord(0 * u.deg, 0 * u.deg).skyoffset_frame(),
+        )
+        np.testing.assert_allclose(x_arcsec, [0, 0], atol=1e-6)
+        np.testing.assert_allclose(y_arcsec, [0, 1], atol=1e-6)
+
+    def test_len_mismatch_throws(self):
+        tgt = StarField(
+            positions={"x": np.zeros(3), "y": np.zeros(3)},
+            spectra=np.array(["A0V", "G2V", "A0V"]),
+            band="R",
+        )
+        with pytest.raises(ValueError):
+            tgt.brightnesses = np.array([5., 6.])
+
+    def test_to_source_matches_per_star(self, offline_field):
+        spectra = [offline_field[i] for i in (0, 1, 0, 1)]
+        mags = [12., 13., 14., 15.5]
+        per_star = StarField(
+            positions=[(0, 0), (0, 1), (1, 0), (2, 2)],
+            spectra=spectra,
+            brightnesses=[m * u.ABmag for m in mags],
+            band="R",
+        ).to_source().fields[0].field
+        columnar = StarField(
+            positions={"x": np.array([0, 0, 1, 2]),
+                       "y": np.array([0, 1, 0, 2])},
+            spectra=np.array(spectra),
+            brightnesses=np.array(mags) * u.ABmag,
+            band="R",
+        ).to_source().fields[0].field
+        for col in ("x", "y", "ref"):
+            np.testing.assert_array_equal(columnar[col], per_star[col])
+        np.testing.assert_allclose(
+            columnar["weight"], per_star["weight"], rtol=1e-12
+        )
+
+
+class TestStarFieldFromTable:
+    @pytest.fixture
+    def catalog(self, offline_field):
+        return Table({
+            "xpos": [0., 0., 1., 2.] * u.arcsec,
+            "ypos": [0., 60., 0., 120.] * u.arcmin / 60,
+            "spectrum": [offline_field[i] for i in (0, 1, 0, 1)],
+            "brightness": [12., 13., 14., 15.5] * u.ABmag,
+        })
+
+    def _fields_equal(self, first, second):
+        first = first.to_source().fields[0].field
+        second = second.to_source().fields[0].field
+        for col in ("x", "y", "ref"):
+            np.testing.assert_allclose(first[col], second[col], atol=1e-6)
+        np.testing.assert_allclose(first["weight"], second["weight"])
+
+    def test_from_table(self, catalog, offline_field):
+        tgt = StarField.from_table(
+            catalog, columns={"x": "xpos", "y": "ypos"}, band="R"
+        )
+        self._fields_equal(tgt, StarField(
+            positions=[(0, 0), (0, 60), (1, 0), (2, 120)],
+            spectra=[offline_field[i] for i in (0, 1, 0, 1)],
+            brightnesses=np.array([12., 13., 14., 15.5]) * u.ABmag,
+            band="R",
+        ))
+
+    @pytest.mark.parametrize("columns", [
+        {"x": "xpos", "y": "ypos"},
+        {"ra": "xpos", "dec": "ypos"},
+    ], ids=["xy", "radec"])
+    def test_distance_column(self, catalog, columns):
+        catalog["distance"] = [10., 20., 30., 40.] * u.pc
+        tgt = StarField.from_table(catalog, columns=columns, band="R")
+        np.testing.assert_allclose(
+            tgt.positions.distance.to_value(u.pc), [10., 20., 30., 40.]
+        )
+
+    def test_from_ecsv(self, catalog, tmp_path):
+        path = tmp_path / "catalog.ecsv"
+        catalog.write(path)
+        kwargs = {"columns": {"x": "xpos", "y": "ypos"}, "band": "R"}
+        self._fields_equal(
+            StarField.from_ecsv(path, **kwargs),
+            StarField.from_table(catalog, **kwargs),
+        )
+
+    def test_from_fits(self, catalog, tmp_path):
+        # FITS cannot store mag(AB), so use a flux density column.
+        catalog["brightness"] = catalog["brightness"].to(u.Jy)
+        path = tmp_path / "catalog.fits"
+        catalog.write(path)
+        kwargs = {"columns": {"x": "xpos", "y": "ypos"}, "band": "R"}
+        self._fields_equal(
+            StarField.from_fits(path, **kwargs),
+            StarField.from_table(catalog, **kwargs),
+        )
+
+    def test_from_structured_array(self):
+        array = np.zeros(3, dtype=[
+            ("x", float), ("y", float), ("spectrum", "U4"),
+            ("brightness", float),
+        ])
+        array["spectrum"] = ["A0V", "G2V", "A0V"]
+        array["brightness"] = [10, 11, 12]
+        tgt = StarField.from_table(array, band="R")
+        assert tgt.spectra == ["A0V", "G2V", "A0V"]
+        np.testing.assert_array_equal(tgt.brightnesses.value, [10, 11, 12] * u.mag)
+
+    def test_band_column(self, catalog):
+        catalog["band"] = ["R", "V", "R", "V"]
+        tgt = StarField.from_table(catalog, columns={"x": "xpos", "y": "ypos"})
+        assert [b.locator for b in tgt.brightnesses] == ["R", "V", "R", "V"]
+        assert tgt.brightnesses[1].value == 13 * u.mag
+
+    def test_single_band_column_stays_columnar(self, catalog):
+        catalog["band"] = ["R"] * 4
+        tgt = StarField.from_table(catalog, columns={"x": "xpos", "y": "ypos"})
+        assert tgt.brightnesses.locator == "R"
+
+    def test_unknown_band_raises(self, catalog):
+        catalog["band"] = ["R", "bogus", "R", "V"]
+        with pytest.raises(ValueError):
+            StarField.from_table(catalog, columns={"x": "xpos", "y": "ypos"})
+
+    @pytest.mark.parametrize("colname", ["xpos", "brightness"])
+    def test_masked_entries_raise(self, catalog, colname):
+        catalog = Table(catalog, masked=True)
+        catalog[colname].mask[1] = True
+        with pytest.raises(ValueError, match="masked"):
+            StarField.from_table(
+                catalog, columns={"x": "xpos", "y": "ypos"}, band="R"
+            )
+
+    def test_unmasked_masked_columns(self, catalog):
+        tgt = StarField.from_table(
+            Table(catalog, masked=True),
+            columns={"x": "xpos", "y": "ypos"}, band="R",
+        )
+        assert not isinstance(tgt.brightnesses.value, Masked)
+        np.testing.assert_array_equal(
+            tgt.brightnesses.value.value, [12., 13., 14., 15.5]
+        )
+
+    @pytest.mark.parametrize("colname", ["ypos", "spectrum", "brightness"])
+    def test_missing_column_raises(self, catalog, colname):
+        del catalog[colname]
+        with pytest.raises(ValueError, match=colname):
+            StarField.from_table(
+                catalog, columns={"x": "xpos", "y": "ypos"}, band="R"
+            )
+
+
+class TestStarFieldChunks:
+    @pytest.fixture
+    def field(self, offline_field):
+        rng = np.random.default_rng(7)
+        return StarField(
+            positions={"x": rng.uniform(-5, 5, 25), "y": rng.uniform(-5, 5, 25)},
+            spectra=[offline_field[i % 2] for i in range(25)],
+            brightnesses=rng.uniform(10, 15, 25) * u.ABmag,
+            band="R",
+        )
+
+    @pytest.mark.parametrize("per_star", [False, True])
+    def test_chunks_match_to_source(self, field, per_star):
+        if per_star:
+            column = field.brightnesses
+            field.brightnesses = [
+                replace(column, value=value) for value in column.value
+            ]
+        whole = field.to_source().fields[0].field
+        chunks = list(field.iter_sources(chunk_size=10))
+        assert [len(src.fields[0].field) for src in chunks] == [10, 10, 5]
+        combined = vstack([src.fields[0].field for src in chunks])
+        for col in ("x", "y", "ref", "weight"):
+            np.testing.assert_allclose(combined[col], whole[col])
+
+    def test_spectra_are_shared(self, field):
+        first, *rest = field.iter_sources(chunk_size=10)
+        for src in rest:
+            assert src.fields[0].spectra is first.fields[0].spectra
+
+    def test_invalid_chunk_size_raises(self, field):
+        with pytest.raises(ValueError):
+            next(field.iter_sources(chunk_size=0))
+
+
+class TestStarFieldFovCulling:
+    optical_train = {"pixel_scale": 1*u.arcsec/u.pix, "width": 4,
+                     "height": 4}
+
+    @pytest.fixture
+    def field(self, offline_field):
+        return StarField(
+            positions={"x": np.array([0., 1., 10., -1.5, 3.]),
+                       "y": np.array([0., -1., 0., 1.5, 0.])},
+            spectra=[offline_field[i] for i in (0, 0, 1, 0, 0)],
+            brightnesses=np.array([10., 11., 12., 13., 14.]) * u.ABmag,
+            band="R",
+        )
+
+    def test_culls_before_resolving(self, field):
+        tbl = field.to_source(self.optical_train, fov_margin=0).fields[0].field
+        np.testing.assert_array_equal(tbl["x"], [0., 1., -1.5])
+        whole = field.to_source().fields[0].field
+        np.testing.assert_allclose(tbl["weight"], whole["weight"][[0, 1, 3]])
+
+        src = field.to_source(self.optical_train, fov_margin=0)
+        assert list(src.fields[0].spectra) == [0]  # off-field template unused
+
+    def test_margin(self, field):
+        src = field.to_source(self.optical_train, fov_margin=1.5)
+        assert len(src.fields[0].field) == 4
+
+    def test_per_star_and_chunks(self, field):
+        column = field.brightnesses
+        field.brightnesses = [
+            replace(column, value=value) for value in column.value
+        ]
+        chunks = list(field.iter_sources(2, self.optical_train, fov_margin=0))
+        assert [len(src.fields[0].field) for src in chunks] == [2, 1, 0]
+
+    def test_needs_optical_train(self, field):
+        with pytest.raises(ValueError):
+            field.to_source(fov_margin=0)
+
+    def test_all_culled(self, field):
+        src = field.to_source(self.optical_train, fov_margin=-10)
+        assert len(src.fields[0].field) == 0
+        assert list(src.fields[0].spectra) == [0]  # unreferenced template
+
+    def test_empty_first_chunk(self, field):
+        field.positions = {"x": np.array([10., 10., 0., 1., 3.]),
+                           "y": np.array([0., 0., 0., -1., 0.])}
+        chunks = list(field.iter_sources(2, self.optical_train, fov_margin=0))
+        assert [len(src.fields[0].field) for src in chunks] == [0, 2, 0]
+        np.testing.assert_array_equal(chunks[1].fields[0].field["ref"], [1, 0])
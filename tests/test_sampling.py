@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for stellar/sampling.py."""
+
+import numpy as np
+
+from scopesim_targets.stellar import sampling
+
+
+def _draw(size, rng):
+    return rng.random(size), rng.integers(10, size=size)
+
+
+class TestSampleChunked:
+    def test_lengths(self, monkeypatch):
+        monkeypatch.setattr(sampling, "CHUNK_SIZE", 16)
+        seed = np.random.SeedSequence(1)
+        values, ints = sampling.sample_chunked(_draw, 50, seed)
+        assert len(values) == len(ints) == 50
+
+    def test_empty(self):
+        values = sampling.sample_chunked(
+            lambda size, rng: rng.random(size), 0, np.random.SeedSequence(1)
+        )
+        assert values.shape == (0,)
+
+    def test_reproducible(self):
+        first, second = (
+            sampling.sample_chunked(_draw, 10, np.random.SeedSequence(1))
+            for _ in range(2)
+        )
+        assert (first[0] == second[0]).all()
+
+    def test_repeated_calls_draw_new_samples(self):
+        seed = np.random.SeedSequence(1)
+        first = sampling.sample_chunked(_draw, 10, seed)
+        second = sampling.sample_chunked(_draw, 10, seed)
+        assert not (first[0] == second[0]).all()
+
+
+def test_as_seed_sequence_passes_through():
+    seed = np.random.SeedSequence(1)
+    assert sampling.as_seed_sequence(seed) is seed
+    assert sampling.as_seed_sequence(1).entropy == 1
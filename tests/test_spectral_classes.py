@@ -6,12 +6,15 @@ import numpy as np
 from astropy import units as u
 from astropy.table import QTable, Row
 
+from scopesim_targets import data_utils
 from scopesim_targets.spectral_classes import (
     StellarParameters,
     SpectralClass,
     TeffRange,
     teff_range_overlap,
+    spectral_type_codes,
 )
+from astar_utils import SpectralType
 
 
 class TestStellarParameters:
@@ -36,6 +39,16 @@ class TestStellarParameters:
         np.testing.assert_array_equal(closest["spectral_type"], desired)
         assert isinstance(closest, (Row, QTable))
 
+    def test_closest_mass_independent_of_other_values(self):
+        # Masked masses (brown dwarfs) must not disturb the lookup order
+        stp = StellarParameters()
+        masses = [0.9, 0.719, 100, 0.05, 0.3] * u.solMass
+        np.testing.assert_array_equal(
+            stp.closest_mass_indices(masses),
+            [stp.closest_mass_indices(mass) for mass in masses],
+        )
+        assert not stp.table["mass"].mask[stp.closest_mass_indices(masses)].any()
+
     @pytest.mark.parametrize(
         ("teff", "desired"),
         (
@@ -50,9 +63,150 @@ class TestStellarParameters:
         np.testing.assert_array_equal(closest["spectral_type"], desired)
         assert isinstance(closest, (Row, QTable))
 
+    @pytest.mark.parametrize(
+        ("spectype", "desired"),
+        (
+            (SpectralType("G2V"), ("G2V",)),
+            ("K5V", ("K5V",)),
+            (["G2V", "K5V", "G2V"], ("G2V", "K5V", "G2V")),
+            (np.array(["A0V", "M0V"]), ("A0V", "M0V")),
+        ),
+    )
+    def test_closest_spectral_type(self, spectype, desired):
+        stp = StellarParameters()
+        closest = stp.closest_spectral_type(spectype)
+        np.testing.assert_array_equal(
+            [str(spt) for spt in closest["spectral_type"]], desired
+        )
+        assert isinstance(closest, QTable)
+
+    def test_closest_spectral_type_columns(self):
+        stp = StellarParameters()
+        closest = stp.closest_spectral_type(["G2V", "M0V"], columns="teff")
+        assert closest.colnames == ["teff"]
+
+    def test_closest_spectral_type_indices_from_codes(self):
+        stp = StellarParameters()
+        spectypes = np.array(["G2V", "B3", "M4.5V", "G2V"])
+        codes = spectral_type_codes(spectypes)
+        assert codes.shape == (4, 2)
+        np.testing.assert_array_equal(
+            stp.closest_spectral_type_indices(codes),
+            stp.closest_spectral_type_indices(list(spectypes)),
+        )
+
+    def test_interpolate_output_columns(self):
+        stp = StellarParameters()
+        masses = [0.5, 1, 2] * u.solMass
+        full = stp.interpolate("mass", masses)
+        subset = stp.interpolate("mass", masses, columns=["M_V", "teff"])
+        assert subset.colnames == ["M_V", "teff"]
+        for col in subset.colnames:
+            np.testing.assert_array_equal(subset[col], full[col])
+
+    def test_interpolate_invalid_output_column(self):
+        stp = StellarParameters()
+        with pytest.raises(ValueError, match="cannot interpolate"):
+            stp.interpolate("mass", [1] * u.solMass, columns="mass")
+
+    def test_interpolators_are_cached(self):
+        stp = StellarParameters()
+        stp.interpolate("mass", [1] * u.solMass, columns="M_V")
+        interpolator = stp._interpolators["mass", "M_V"]
+        stp.interpolate("mass", [2, 3] * u.solMass, extrapolate_phot=True)
+        assert stp._interpolators["mass", "M_V"] is interpolator
+        assert len(stp._interpolators) == len(stp.table.colnames) - 2
+
+    def test_shared_instance(self):
+        assert StellarParameters.shared() is StellarParameters.shared()
+        assert StellarParameters.shared("M_J") is StellarParameters.shared(
+            ["M_J"]
+        )
+        assert StellarParameters.shared("M_J") is not StellarParameters.shared()
+
+    def test_table_data_shared_and_read_only(self):
+        stp_a, stp_b = StellarParameters(), StellarParameters()
+        assert stp_a.table is not stp_b.table
+        assert np.shares_memory(stp_a.table["teff"], stp_b.table["teff"])
+        with pytest.raises(ValueError, match="read-only"):
+            stp_a.table["teff"][0] = 1 * u.K
+
+    def test_subset_has_own_lookups(self):
+        stp = StellarParameters.shared()
+        stp.closest_mass(1 * u.solMass)
+        dwarfs = stp.subset(stp.table.loc_indices["G0":])
+        assert str(dwarfs.table["spectral_type"][0]) == "G0V"
+        assert str(dwarfs.closest_mass(1e4 * u.solMass)["spectral_type"]) == "G0V"
+        assert str(stp.closest_mass(1e4 * u.solMass)["spectral_type"]) == "O3V"
+
 # TODO: Add tests to check if wrong or missing input units throw
 
 
+class TestTableCache:
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(data_utils, "BINARY_CACHE_DIR", tmp_path)
+        StellarParameters.clear_table_cache()
+        yield tmp_path
+        StellarParameters.clear_table_cache()
+
+    @staticmethod
+    def _assert_tables_equal(table_a, table_b):
+        assert table_a.colnames == table_b.colnames
+        for name in table_a.colnames:
+            col_a, col_b = table_a[name], table_b[name]
+            assert type(col_a) is type(col_b)
+            if name == "spectral_type":
+                assert list(col_a) == list(col_b)
+                continue
+            assert col_a.unit == col_b.unit
+            np.testing.assert_array_equal(
+                getattr(col_a, "mask", False), getattr(col_b, "mask", False)
+            )
+            np.testing.assert_array_equal(
+                getattr(col_a, "unmasked", col_a),
+                getattr(col_b, "unmasked", col_b),
+            )
+
+    def test_round_trip(self, cache_dir):
+        parsed = StellarParameters().table
+        cache_file, = cache_dir.rglob("*.npz")
+        assert not list(cache_dir.rglob("*.part"))
+        StellarParameters.clear_table_cache()
+        cached = StellarParameters().table
+        self._assert_tables_equal(parsed, cached)
+        assert cached.loc["G2V"]["teff"] == 5770 * u.K
+
+    def test_meta_round_trip(self, cache_dir):
+        parsed = StellarParameters().table
+        StellarParameters.clear_table_cache()
+        cached = StellarParameters().table
+        assert parsed.meta["version"] == "2022.4.16"
+        assert dict(cached.meta) == dict(parsed.meta)
+
+    def test_unreadable_cache_is_replaced(self, cache_dir):
+        parsed = StellarParameters().table
+        cache_file, = cache_dir.rglob("*.npz")
+        cache_file.write_bytes(b"garbage")
+        StellarParameters.clear_table_cache()
+        self._assert_tables_equal(parsed, StellarParameters().table)
+        with np.load(cache_file) as arrays:
+            assert "colnames" in arrays
+
+    def test_failed_write_leaves_no_partial(self, cache_dir, monkeypatch):
+        def savez(file, **arrays):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(np, "savez", savez)
+        assert len(StellarParameters().table) == 118
+        assert not list(cache_dir.rglob("*.*"))
+
+    def test_disabled(self, cache_dir, monkeypatch):
+        monkeypatch.setattr(data_utils, "BINARY_CACHE_DIR", None)
+        assert len(StellarParameters().table) == 118
+        assert not list(cache_dir.rglob("*"))
+
+
 class TestTeffRange:
     def test_is_still_tuple(self):
         tr = TeffRange(4000, 5000)
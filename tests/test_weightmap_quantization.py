@@ -6,9 +6,10 @@ sample pixel scales where the ``Box`` edges happen to land exactly between
 pixel centers (6x4 arcsec at 0.05/0.1/0.2/0.4 arcsec/px), so the pixel-center
 rasterization error was invisible -- at incommensurate scales it reached tens
 of percent (e.g. +10.7% at 0.25, -8.7% at 0.37, +28% at 0.8 arcsec/px). The
-fix renders *pixel-averaged* values: exact separable coverage for ``Box``,
-midpoint oversampling for the curved sharp edges (``Disk``, ``Ring``) and the
-Sersic cusp. These tests pin that behaviour at deliberately awkward scales.
+fix renders *pixel-averaged* values: exact separable coverage for ``Box`` and
+the axis-aligned ``Gaussian``, midpoint oversampling of the pixels on the curved
+sharp edges (``Disk``, ``Ring``) and of a window around the Sersic cusp. These tests pin
+that behaviour at deliberately awkward scales.
 
 Naming: T-QUANT-* (quantization), T-CLIP-* (profile larger than the FOV, where
 the weight sum must be the *visible fraction* while the spectrum keeps the
@@ -18,9 +19,9 @@ T-ORIENT (FITS axis order on non-square grids).
 ``Gaussian`` is the smooth cross-check: its total (``2 pi sx sy``) and, for
 ``theta = 0``, its in-window fraction (an erf product) both have closed forms,
 so contained *and* clipped weight sums are checked against independent
-analytic oracles. Its only discretization error is the midpoint rule on a
-smooth integrand, O(scale**2) -- verified to shrink 4x per scale halving --
-which is why its tolerances are tighter than the sharp-edged profiles'.
+analytic oracles. Axis-aligned, its pixel values are exact erf differences, so
+these hold to rounding; rotated, it falls back to the midpoint rule on a smooth
+integrand, O(scale**2).
 
 Tiering: everything here is pure (no network, no ScopeSim ``Source``): the
 profiles are constructed without ``spectrum``/``brightness`` and only
@@ -53,6 +54,16 @@ def _grid(scale, fov=51.2, fov_y=None):
     }
 
 
+def _oversampled(target, grid, oversample=None):
+    """Full-frame midpoint-rule render, the reference for the fast paths."""
+    scale = grid["pixel_scale"].to_value(u.arcsec / u.pixel)
+    x = target._grid_centers(grid["width"], scale)
+    y = target._grid_centers(grid["height"], scale)
+    return target._render_grid(
+        x, y, scale, oversample or target._oversample
+    )
+
+
 def _weight_sum(target, grid):
     weightmap, _ = target._weightmap(grid)
     return float(weightmap.sum())
@@ -106,6 +117,21 @@ class TestCurvedEdges:
         ring = Ring(params={"r_in": 2, "width": 1.5})
         npt.assert_allclose(_weight_sum(ring, _grid(scale)), 1.0, rtol=5e-3)
 
+    @pytest.mark.parametrize("target", [
+        Disk(params={"R_0": 5}),
+        Disk(params={"R_0": 0.1}),  # subpixel: the whole disk is rim
+        Ring(params={"r_in": 2, "width": 1.5}),
+        Ring(params={"r_in": 0, "width": 3}),
+    ], ids=["disk", "subpixel-disk", "ring", "ring-as-disk"])
+    def test_rim_sampling_matches_full_oversampling(self, target):
+        # Only the pixels the edges cross are sampled; interior and exterior
+        # pixels are filled directly. Same midpoint samples, same image.
+        grid = _grid(0.37, fov=25.6, fov_y=19.2)
+        rim = target._render_image(grid)
+        full = _oversampled(target, grid)
+        assert rim.shape == (grid["height"], grid["width"])
+        npt.assert_allclose(rim, full, rtol=0, atol=1e-12)
+
 
 class TestSersicCusp:
     """T-QUANT-SERSIC: the cusp no longer drifts with the input scale."""
@@ -121,6 +147,21 @@ class TestSersicCusp:
         ]
         npt.assert_allclose(fracs[0], fracs[1], rtol=1e-3)
 
+    @pytest.mark.parametrize("params", [
+        {"r_eff": 6, "n": 4},
+        {"r_eff": 0.5, "n": 4},
+        {"r_eff": 10, "n": 6, "ellip": 0.5, "theta": 0.4},
+    ])
+    def test_cusp_window_matches_full_oversampling(self, params):
+        # Only a window around the cusp is oversampled; outside it the plain
+        # pixel-center render must already agree with the full-frame one.
+        sersic = Sersic(params=params)
+        grid = _grid(0.25, fov=25.6)
+        adaptive = sersic._render_image(grid)
+        full = _oversampled(sersic, grid)
+        npt.assert_allclose(adaptive.sum(), full.sum(), rtol=1e-5)
+        npt.assert_allclose(adaptive, full, rtol=0, atol=1e-6 * full.max())
+
 
 class TestGaussianOracles:
     """T-QUANT-GAUSS: the smooth profile against its closed forms."""
@@ -155,15 +196,27 @@ class TestGaussianOracles:
         # T-CLIP-GAUSS: sigma comparable to the window, so a sizable fraction
         # of the total lies outside the FOV -- the no-sharp-cutoff analogue of
         # the overflowing box. The weight sum must equal the erf window
-        # fraction (~0.79), with only the O(scale**2) midpoint-rule residual
-        # of a smooth integrand (measured +6.6e-5 at 0.2 arcsec/px, shrinking
-        # 4x per scale halving), hence rtol 2e-4.
+        # fraction (~0.79). The axis-aligned render integrates each pixel
+        # exactly (the midpoint rule left +6.6e-5 here), hence rtol 1e-9.
         grid = _grid(0.2, fov=12.8)
         half = grid["width"] * 0.2 / 2
         gauss = Gaussian(params={"x_stddev": 4, "y_stddev": 4})
         oracle = erf(half / (4 * np.sqrt(2))) ** 2
         assert _weight_sum(gauss, grid) < 0.999  # genuinely clipped
-        npt.assert_allclose(_weight_sum(gauss, grid), oracle, rtol=2e-4)
+        npt.assert_allclose(_weight_sum(gauss, grid), oracle, rtol=1e-9)
+
+    @pytest.mark.parametrize("theta", [0, np.pi / 2, np.pi])
+    def test_axis_aligned_matches_oversampled(self, theta):
+        # The exact erf render is the limit of midpoint oversampling; a 20x20
+        # render of the same model must agree to its midpoint residual (~(scale
+        # / 20)**2 / (24 sx**2) of the peak = 1.4e-5 here),
+        # including the swapped axes at 90 deg on a non-square grid.
+        grid = _grid(0.37, fov=12.8, fov_y=9.6)
+        gauss = Gaussian(params={"x_stddev": 1, "y_stddev": 2.5, "theta": theta})
+        exact = gauss._render_image(grid)
+        sampled = _oversampled(gauss, grid, oversample=20)
+        assert exact.shape == (grid["height"], grid["width"])
+        npt.assert_allclose(exact, sampled, rtol=0, atol=5e-5 * exact.max())
 
     def test_rotated_total_invariant(self):
         # The carried total of a contained Gaussian is rotation-invariant